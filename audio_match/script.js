@@ -1,7 +1,7 @@
 class AudioMatchGame {
     constructor() {
         this.words = [];
-        this.allCategories = {}; // Store all categories from JSON
+        this.allCategories = {}; // Category name -> {words, file, entries} from the compiled index
         this.currentCategory = null; // Currently selected category
         this.currentWord = '';
         this.currentAudio = null;
@@ -36,9 +36,11 @@ class AudioMatchGame {
 
     async loadCategories() {
         try {
-            const response = await fetch('words.json');
+            // compiled/ is built from words.json by scripts/compile_configs.py:
+            // the index lists the categories, each category's words are loaded on demand
+            const response = await fetch('compiled/index.json');
             const data = await response.json();
-            this.allCategories = data;
+            this.allCategories = data.groups;
             
             // Check URL parameter first (for Golda integration)
             const urlParams = new URLSearchParams(window.location.search);
@@ -60,11 +62,14 @@ class AudioMatchGame {
             console.error('Error loading categories:', error);
             // Fallback words if JSON fails to load
             this.allCategories = {
-                'basic': [
-                    {word: 'mom', weight: 1},
-                    {word: 'cat', weight: 1},
-                    {word: 'dog', weight: 1}
-                ]
+                'basic': {
+                    words: 3,
+                    entries: [
+                        {word: 'mom', weight: 1},
+                        {word: 'cat', weight: 1},
+                        {word: 'dog', weight: 1}
+                    ]
+                }
             };
             this.showCategorySelection();
         }
@@ -104,7 +109,7 @@ class AudioMatchGame {
             
             const count = document.createElement('div');
             count.className = 'category-count';
-            count.textContent = `${this.allCategories[categoryKey].length} words`;
+            count.textContent = `${this.allCategories[categoryKey].words} words`;
             
             categoryOption.appendChild(icon);
             categoryOption.appendChild(name);
@@ -118,9 +123,19 @@ class AudioMatchGame {
         });
     }
 
-    selectCategory(categoryKey) {
+    async selectCategory(categoryKey) {
+        const category = this.allCategories[categoryKey];
+        if (!category.entries) {
+            try {
+                const response = await fetch(`compiled/${category.file}`);
+                category.entries = await response.json();
+            } catch (error) {
+                console.error('Error loading category words:', error);
+                return;
+            }
+        }
         this.currentCategory = categoryKey;
-        this.words = this.allCategories[categoryKey];
+        this.words = category.entries;
         
         // Save selection to localStorage
         localStorage.setItem('audioMatchCategory', categoryKey);
@@ -293,7 +308,9 @@ class AudioMatchGame {
             this.currentAudio.currentTime = 0;
         }
         
-        this.currentAudio = new Audio(`../shared/static/audio/${this.currentWord}.mp3`);
+        // Replace spaces with underscores in audio filename (same as images)
+        const audioFileName = this.currentWord.replace(/ /g, '_');
+        this.currentAudio = new Audio(`../shared/static/audio/${audioFileName}.mp3`);
         this.currentAudio.play().catch(error => {
             console.error('Error playing audio:', error);
             // If autoplay fails, show visual prompt
@@ -1,8 +1,12 @@
 from gtts import gTTS
+import io
 import os
 
+from metrics_utils import NULL_METRICS
 
-def create_audio_files(words: list, language: str = 'en', output_dir: str = 'audio_words'):
+
+def create_audio_files(words: list, language: str = 'en', output_dir: str = 'audio_words', progress_callback=None,
+                       journal=None, metrics=NULL_METRICS):
     """
     Creates an audio file for each word in a list using gTTS.
 
@@ -10,6 +14,14 @@ def create_audio_files(words: list, language: str = 'en', output_dir: str = 'aud
         words: A list of strings (words) to convert to speech.
         language: The language of the words (default is 'en' for English).
         output_dir: The directory where the audio files will be saved.
+        progress_callback: Optional callable invoked as
+            progress_callback(words_done, total_words, word) after each word.
+            It may raise to abort processing (e.g. on cancellation).
+        journal: Optional journal_utils.IngestJournal. Words it already holds
+            (with an intact audio file) are not sent to gTTS again; each
+            successfully created file is recorded.
+        metrics: Optional metrics_utils.StageMetrics. The TTS request and the
+            disk write of every word are timed on it, labelled with the 'word'.
 
     Returns:
         dict: A dictionary mapping words to their output file paths.
@@ -22,7 +34,7 @@ def create_audio_files(words: list, language: str = 'en', output_dir: str = 'aud
     result_paths = {}
     
     # Loop through each word in the provided list.
-    for word in words:
+    for index, word in enumerate(words):
         # Sanitize the word to create a valid filename.
         # This replaces spaces with underscores and removes characters that are not
         # alphanumeric. You can adjust this as needed.
@@ -32,22 +44,42 @@ def create_audio_files(words: list, language: str = 'en', output_dir: str = 'aud
         output_path = os.path.join(output_dir, safe_filename)
         result_paths[word] = output_path
         
+        journal_key = f"audio:{language}:{word}"
+        if journal and journal.is_done(journal_key):
+            print(f"Skipping audio for '{word}' (already done)")
+            if progress_callback:
+                progress_callback(index + 1, len(words), word)
+            continue
+        
         # Always create/overwrite the file (allows fixing bad files)
         try:
-            # Create the gTTS object with the word and language.
-            tts = gTTS(text=word, lang=language)
+            # Create the gTTS object with the word and language, and fetch the
+            # speech into memory so network time and disk writes are timed apart.
+            with metrics.stage("tts", word=word) as info:
+                tts = gTTS(text=word, lang=language)
+                buffer = io.BytesIO()
+                tts.write_to_fp(buffer)
+                info['bytes'] = buffer.tell()
             
             # Save the audio file (will overwrite if exists).
-            tts.save(output_path)
+            with metrics.stage("write", word=word) as info:
+                with open(output_path, 'wb') as f:
+                    f.write(buffer.getbuffer())
+                info['bytes'] = buffer.tell()
             
             if os.path.exists(output_path):
                 print(f"Successfully created/updated audio for '{word}' -> {output_path}")
+                if journal:
+                    journal.record(journal_key, [output_path])
             else:
                 print(f"Created audio for '{word}' -> {output_path}")
         
         except Exception as e:
             print(f"Could not create audio for '{word}'. Error: {e}")
             result_paths[word] = None
+        
+        if progress_callback:
+            progress_callback(index + 1, len(words), word)
     
     return result_paths
 
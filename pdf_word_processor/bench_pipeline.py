@@ -0,0 +1,346 @@
+"""
+Benchmarks for the media pipeline.
+
+Times process_pdf_images, crop_white_border, create_audio_files (against a
+stub TTS, so no network is involved) and generate_image_cards_pdf on
+synthetic inputs generated locally, at several scales. Each case records the
+median wall time and throughput, timed with tracemalloc off, and the peak
+Python heap from a separate run (tracemalloc; memory allocated inside
+MuPDF's C code is not included). The audio cases run without gTTS installed.
+
+Usage (from pdf_word_processor/):
+    python bench_pipeline.py                    # run and compare against the baseline
+    python bench_pipeline.py --save-baseline    # run and store the results as the new baseline
+    python bench_pipeline.py --scale small --only crop
+
+A case is flagged as a regression when its median time exceeds the
+baseline's by more than --threshold (default 25%); the exit code is then 1.
+Baselines are machine-specific: save one on the machine you compare on.
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+import types
+
+import fitz  # PyMuPDF
+from PIL import Image, ImageDraw, ImageFilter
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_baseline.json")
+
+PAGE_SIZES = {
+    'A5': fitz.paper_rect('a5'),
+    'A4': fitz.paper_rect('a4'),
+    'A3': fitz.paper_rect('a3'),
+}
+
+SCALES = {
+    'small': {'pages': [4], 'sizes': ['A4'], 'image_widths': [400, 1200], 'words': [10], 'cards': [24]},
+    'medium': {'pages': [4, 16], 'sizes': ['A5', 'A4', 'A3'], 'image_widths': [400, 1200, 2400],
+               'words': [10, 50], 'cards': [24, 96]},
+    'large': {'pages': [4, 16, 48], 'sizes': ['A5', 'A4', 'A3'], 'image_widths': [400, 1200, 2400, 4800],
+              'words': [10, 50, 200], 'cards': [24, 96, 240]},
+}
+
+
+# --- synthetic inputs -----------------------------------------------------
+
+def _picture(width: int, height: int, seed: int) -> Image.Image:
+    """A flashcard-like picture: a few filled shapes on a white background."""
+    rng = random.Random(seed)
+    img = Image.new("RGB", (width, height), "white")
+    draw = ImageDraw.Draw(img)
+    for _ in range(6):
+        x0, y0 = rng.randrange(width // 2), rng.randrange(height // 2)
+        x1, y1 = x0 + rng.randrange(width // 8, width // 2), y0 + rng.randrange(height // 8, height // 2)
+        color = tuple(rng.randrange(256) for _ in range(3))
+        if rng.random() < 0.5:
+            draw.ellipse((x0, y0, x1, y1), fill=color)
+        else:
+            draw.rectangle((x0, y0, x1, y1), fill=color)
+    return img
+
+
+def _jpeg_bytes(img: Image.Image, quality: int = 85) -> bytes:
+    buffer = io.BytesIO()
+    img.save(buffer, "JPEG", quality=quality)
+    return buffer.getvalue()
+
+
+def make_pdf(pages: int, size: str = 'A4', content: str = 'vector', seed: int = 0) -> bytes:
+    """
+    Build a synthetic PDF.
+
+    Args:
+        pages: Number of pages.
+        size: Key of PAGE_SIZES.
+        content: 'vector' (shapes and text drawn on the page), 'raster' (one
+            picture placed in a margin) or 'scanned' (a full-page grey,
+            noisy, slightly blurred scan).
+        seed: Seed for the generated shapes.
+    """
+    rect = PAGE_SIZES[size]
+    doc = fitz.open()
+    rng = random.Random(seed)
+    for page_num in range(pages):
+        page = doc.new_page(width=rect.width, height=rect.height)
+        if content == 'vector':
+            for _ in range(8):
+                x0, y0 = rng.uniform(0, rect.width * 0.6), rng.uniform(0, rect.height * 0.6)
+                shape = fitz.Rect(x0, y0, x0 + rng.uniform(40, 200), y0 + rng.uniform(40, 200))
+                color = (rng.random(), rng.random(), rng.random())
+                page.draw_rect(shape, color=color, fill=color)
+            page.insert_text((72, rect.height - 72), f"word {page_num}", fontsize=36)
+        else:
+            scan = content == 'scanned'
+            # Pictures at roughly 150 DPI of the area they cover
+            area = rect if scan else fitz.Rect(rect.x0 + 72, rect.y0 + 72, rect.x1 - 72, rect.y1 - 72)
+            width, height = int(area.width * 150 / 72), int(area.height * 150 / 72)
+            img = _picture(width, height, seed + page_num)
+            if scan:
+                noise = Image.effect_noise((width, height), 24).convert("RGB")
+                img = Image.blend(img, noise, 0.15).filter(ImageFilter.GaussianBlur(0.8))
+            page.insert_image(area, stream=_jpeg_bytes(img))
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+# --- measurement ----------------------------------------------------------
+
+def measure(func, repeat: int) -> dict:
+    """
+    Run func() repeat times with stdout silenced, after one untimed warm-up
+    run (first-use costs such as font loading would otherwise skew the
+    first case).
+
+    The timed runs are made with tracemalloc off, since tracing every
+    allocation slows Python-heavy stages far more than others. The peak
+    heap is measured in one extra, untimed run.
+
+    Returns:
+        dict: 'seconds' (median), 'min_seconds' and 'peak_kb' (tracemalloc
+            peak of the extra run).
+    """
+    times = []
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        func()
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            times.append(time.perf_counter() - start)
+        tracemalloc.start()
+        try:
+            func()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return {'seconds': statistics.median(times), 'min_seconds': min(times), 'peak_kb': peak // 1024}
+
+
+def bench_process_pdf(scale: dict, work_dir: str):
+    from pdf_utils import process_pdf_images
+
+    for content in ('vector', 'raster', 'scanned'):
+        for size in scale['sizes']:
+            for pages in scale['pages']:
+                # Page size only matters for one page count
+                if size != 'A4' and pages != scale['pages'][-1]:
+                    continue
+                pdf = make_pdf(pages, size, content)
+                words = [f"word{i}" for i in range(pages)]
+                output_dir = os.path.join(work_dir, "pages")
+
+                def run():
+                    shutil.rmtree(output_dir, ignore_errors=True)
+                    process_pdf_images(pdf, output_dir, words_list=words)
+
+                yield f"process_pdf_images/{content}/{size}/{pages}p", pages, "pages", run
+
+
+def bench_crop(scale: dict, work_dir: str):
+    from pdf_utils import crop_white_border
+
+    for width in scale['image_widths']:
+        height = int(width * 1.414)
+        # The picture sits in a wide white border, like a rendered page
+        page = Image.new("RGB", (width, height), "white")
+        page.paste(_picture(width // 2, height // 2, width), (width // 4, height // 4))
+        megapixels = width * height / 1e6
+
+        def run(img=page):
+            crop_white_border(img)
+
+        yield f"crop_white_border/{width}px", megapixels, "MP", run
+
+
+class _StubTTS:
+    """Stands in for gTTS: writes a small fake MP3 instead of calling the network."""
+
+    payload = b"ID3" + bytes(6000)
+
+    def __init__(self, text: str, lang: str = 'en'):
+        self.text = text
+
+    def write_to_fp(self, fp):
+        fp.write(self.payload)
+
+    def save(self, path: str):
+        with open(path, 'wb') as f:
+            self.write_to_fp(f)
+
+
+def bench_audio(scale: dict, work_dir: str):
+    if importlib.util.find_spec("gtts") is None:
+        # Only the stub is called, so the real library needn't be installed
+        stub = types.ModuleType("gtts")
+        stub.gTTS = _StubTTS
+        sys.modules["gtts"] = stub
+    import audio_utils
+
+    audio_utils.gTTS = _StubTTS
+    for count in scale['words']:
+        words = [f"word {i}" for i in range(count)]
+        output_dir = os.path.join(work_dir, "audio")
+
+        def run(words=words):
+            shutil.rmtree(output_dir, ignore_errors=True)
+            audio_utils.create_audio_files(words, output_dir=output_dir)
+
+        yield f"create_audio_files/stub/{count}w", count, "words", run
+
+
+def bench_cards_pdf(scale: dict, work_dir: str):
+    sys.path.insert(0, os.path.join(PROJECT_ROOT, "pdf_generator"))
+    from generate_image_cards_pdf import generate_image_cards_pdf
+
+    for count in scale['cards']:
+        images_dir = os.path.join(work_dir, f"cards_{count}")
+        os.makedirs(images_dir, exist_ok=True)
+        for i in range(count):
+            _picture(400, 400, i).save(os.path.join(images_dir, f"card{i:04d}.jpg"), quality=85)
+        output_file = os.path.join(work_dir, f"cards_{count}.pdf")
+
+        def run(images_dir=images_dir, output_file=output_file):
+            generate_image_cards_pdf(images_dir, output_file)
+
+        yield f"generate_image_cards_pdf/{count}img", count, "images", run
+
+
+BENCHMARKS = {
+    'pdf': bench_process_pdf,
+    'crop': bench_crop,
+    'audio': bench_audio,
+    'cards': bench_cards_pdf,
+}
+
+
+def run_benchmarks(scale_name: str, repeat: int, only: list[str] = None) -> dict:
+    """
+    Run the selected benchmark groups.
+
+    Returns:
+        dict: case name -> result dict ('seconds', 'min_seconds', 'peak_kb',
+            'throughput', 'unit'), or {'skipped': reason} when a group's
+            dependencies (e.g. gTTS, reportlab) are not installed.
+    """
+    results = {}
+    work_dir = tempfile.mkdtemp(prefix="bench_pipeline_")
+    try:
+        for name, bench in BENCHMARKS.items():
+            if only and name not in only:
+                continue
+            try:
+                for case, units, unit, run in bench(SCALES[scale_name], work_dir):
+                    result = measure(run, repeat)
+                    result['throughput'] = units / result['seconds'] if result['seconds'] else None
+                    result['unit'] = unit
+                    results[case] = result
+                    print(f"{case:<44} {result['seconds'] * 1000:>9.1f} ms  "
+                          f"{result['throughput']:>9.1f} {unit}/s  {result['peak_kb']:>8} KB peak")
+            except ImportError as e:
+                results[name] = {'skipped': str(e)}
+                print(f"{name:<44} skipped: {e}")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Return a description of every case that got slower than baseline * (1 + threshold)."""
+    regressions = []
+    for case, result in results.items():
+        previous = baseline.get(case)
+        if 'seconds' not in result or not previous or 'seconds' not in previous:
+            continue
+        ratio = result['seconds'] / previous['seconds']
+        if ratio > 1 + threshold:
+            regressions.append(f"{case}: {previous['seconds'] * 1000:.1f} ms -> "
+                               f"{result['seconds'] * 1000:.1f} ms ({(ratio - 1) * 100:+.0f}%)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the media pipeline.")
+    parser.add_argument("--scale", choices=SCALES, default="medium")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per case; the median is reported")
+    parser.add_argument("--only", action="append", choices=BENCHMARKS, help="Only this group (repeatable)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON file")
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the baseline")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown before flagging")
+    parser.add_argument("--output", help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.scale, args.repeat, args.only)
+    report = {
+        'scale': args.scale,
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'created_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    if args.save_baseline:
+        baseline = {'results': {}}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, 'r', encoding='utf-8') as f:
+                baseline = json.load(f)
+        # Merge, so baselines for several scales / groups can coexist
+        baseline.update({key: value for key, value in report.items() if key != 'results'})
+        baseline['results'].update({case: result for case, result in results.items() if 'seconds' in result})
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(baseline, f, indent=2)
+        print(f"\nBaseline saved to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print("\nNo baseline yet; run with --save-baseline to create one.")
+        return
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)['results']
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}:")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+    print(f"\nNo regressions over {args.threshold:.0%} against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows has no fcntl; fall back to unlocked writes.
+    fcntl = None
+
+
+# Entry formats used by the game JSON configs.
+# "weighted": [{"word": "cat", "weight": 1}, ...]  (audio_match/words.json)
+# "plain":    ["cat", "dog", ...]                  (image_grid, connect4_words)
+WEIGHTED = "weighted"
+PLAIN = "plain"
+
+
+def load_json_file(filepath: str) -> dict:
+    """Load a JSON file."""
+    with open(filepath, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_json_file(filepath: str, data: dict):
+    """
+    Save data to a JSON file atomically.
+
+    The data is written to a temporary file in the same directory and then
+    renamed over the target, so readers never see a half-written config.
+    """
+    directory = os.path.dirname(os.path.abspath(filepath))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates files with 0600; keep the original permissions.
+        if os.path.exists(filepath):
+            os.chmod(tmp_path, os.stat(filepath).st_mode & 0o777)
+        else:
+            os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+@contextmanager
+def locked_file(filepath: str):
+    """
+    Hold an exclusive lock for a file while the block runs.
+
+    The lock lives on a sidecar "<file>.lock" so it survives the atomic
+    rename done by save_json_file.
+    """
+    lock_path = str(filepath) + ".lock"
+    with open(lock_path, 'a') as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def _entry_word(entry, entry_format: str):
+    """Return the word an existing config entry refers to."""
+    if entry_format == WEIGHTED:
+        return entry.get('word') if isinstance(entry, dict) else None
+    return entry
+
+
+def _make_entry(word: str, entry_format: str):
+    """Build a new config entry for a word."""
+    if entry_format == WEIGHTED:
+        return {"word": word, "weight": 1}
+    return word
+
+
+def merge_words_into_configs(updates: dict, words: list[str]) -> dict:
+    """
+    Merge a list of words into one or more game JSON configs.
+
+    Each file is read once, every requested group in it is indexed with a
+    set, and the file is rewritten atomically under a lock only if
+    something changed.
+
+    Args:
+        updates: Mapping of update name to a dict with keys
+            'file' (path to the JSON config), 'group' (top-level key to add to)
+            and optionally 'format' (WEIGHTED or PLAIN, default PLAIN).
+        words: The words to add to every target group.
+
+    Returns:
+        dict: Mapping of update name to a diff dict with keys 'file', 'group',
+            'added' (words appended), 'existing' (words already present) and
+            'error' (None, or a message if the file could not be updated).
+    """
+    # Preserve order while dropping duplicates in the incoming list.
+    unique_words = list(dict.fromkeys(words))
+
+    # Group the updates by file so each config is loaded and written once.
+    by_file = {}
+    for name, config in updates.items():
+        by_file.setdefault(str(config['file']), []).append((name, config))
+
+    diff = {}
+    for filepath, file_updates in by_file.items():
+        if not os.path.exists(filepath):
+            for name, config in file_updates:
+                diff[name] = {
+                    'file': Path(filepath),
+                    'group': config['group'],
+                    'added': [],
+                    'existing': [],
+                    'error': "JSON file not found",
+                }
+            continue
+
+        with locked_file(filepath):
+            data = load_json_file(filepath)
+            changed = False
+
+            for name, config in file_updates:
+                group = config['group']
+                entry_format = config.get('format', PLAIN)
+                entries = data.setdefault(group, [])
+                index = {_entry_word(entry, entry_format) for entry in entries}
+
+                added = []
+                existing = []
+                for word in unique_words:
+                    if word in index:
+                        existing.append(word)
+                        continue
+                    entries.append(_make_entry(word, entry_format))
+                    index.add(word)
+                    added.append(word)
+
+                changed = changed or bool(added)
+                diff[name] = {
+                    'file': Path(filepath),
+                    'group': group,
+                    'added': added,
+                    'existing': existing,
+                    'error': None,
+                }
+
+            if changed:
+                save_json_file(filepath, data)
+
+    return diff
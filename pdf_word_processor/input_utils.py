@@ -0,0 +1,104 @@
+import io
+import os
+import zipfile
+from PIL import Image
+
+
+# File types accepted from image folders and ZIP archives.
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp', '.tif', '.tiff')
+
+
+def word_from_filename(name: str) -> str:
+    """
+    Derives the default word for an image from its file name.
+
+    "ice_cream.jpg" becomes "ice cream", which sanitizes back to "ice_cream".
+    """
+    stem = os.path.splitext(os.path.basename(name))[0]
+    return stem.replace('_', ' ').strip()
+
+
+def _is_image_name(name: str) -> bool:
+    """True for image files, skipping hidden files and macOS resource forks."""
+    base = os.path.basename(name)
+    if not base or base.startswith('.') or name.startswith('__MACOSX/'):
+        return False
+    return base.lower().endswith(IMAGE_EXTENSIONS)
+
+
+def _open_zip(source) -> zipfile.ZipFile:
+    """Open a ZIP archive from a path or from in-memory bytes."""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return zipfile.ZipFile(io.BytesIO(bytes(source)))
+    return zipfile.ZipFile(source)
+
+
+def _zip_image_names(archive: zipfile.ZipFile) -> list[str]:
+    """Image members of an open archive, sorted."""
+    return sorted(
+        info.filename for info in archive.infolist()
+        if not info.is_dir() and _is_image_name(info.filename)
+    )
+
+
+def _is_directory(source) -> bool:
+    return isinstance(source, (str, os.PathLike)) and os.path.isdir(source)
+
+
+def list_image_names(source) -> list[str]:
+    """
+    Lists the images in a folder or ZIP archive, in processing order.
+
+    Args:
+        source: A directory path, a ZIP file path, or ZIP contents as bytes.
+
+    Returns:
+        list: Image names (relative to the folder / archive), sorted.
+    """
+    if _is_directory(source):
+        names = []
+        for root, _, files in os.walk(source):
+            for filename in files:
+                rel_path = os.path.relpath(os.path.join(root, filename), source)
+                if _is_image_name(rel_path):
+                    names.append(rel_path)
+        return sorted(names)
+
+    with _open_zip(source) as archive:
+        return _zip_image_names(archive)
+
+
+def iter_images(source, only: set = None):
+    """
+    Yields (name, image) for every image in a folder or ZIP archive.
+
+    ZIP members are decoded straight from the archive one at a time; nothing
+    is extracted to disk and only one image is held in memory at once.
+
+    Args:
+        source: A directory path, a ZIP file path, or ZIP contents as bytes.
+        only: Optional set of names to restrict to; other images are not decoded.
+
+    Yields:
+        tuple: (name, PIL Image), in the order of list_image_names.
+    """
+    if _is_directory(source):
+        for name in list_image_names(source):
+            if only is not None and name not in only:
+                continue
+            with Image.open(os.path.join(source, name)) as img:
+                img.load()
+                yield name, img
+        return
+
+    with _open_zip(source) as archive:
+        for name in _zip_image_names(archive):
+            if only is not None and name not in only:
+                continue
+            with archive.open(name) as member:
+                # Seeking backwards in a compressed member restarts
+                # decompression, and PIL seeks while sniffing formats, so
+                # buffer this one member's bytes.
+                img = Image.open(io.BytesIO(member.read()))
+                img.load()
+                yield name, img
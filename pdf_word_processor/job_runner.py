@@ -0,0 +1,345 @@
+import hashlib
+import os
+import shutil
+import tempfile
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+
+from config_utils import load_json_file, save_json_file
+from metrics_utils import NULL_METRICS, StageMetrics
+
+
+# Job states, as stored in each job's job.json.
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+INTERRUPTED = "interrupted"
+
+FINISHED_STATES = (DONE, FAILED, CANCELLED, INTERRUPTED)
+
+
+class JobCancelled(Exception):
+    """Raised inside a worker when the job's cancel flag has been set."""
+
+
+def default_jobs_root() -> str:
+    """Directory holding the on-disk job table."""
+    return os.path.join(tempfile.gettempdir(), "pdf_word_processor_jobs")
+
+
+def _job_file(job_dir: str) -> str:
+    return os.path.join(job_dir, "job.json")
+
+
+def _cancel_file(job_dir: str) -> str:
+    return os.path.join(job_dir, "cancel")
+
+
+def _source_file(output_dir: str) -> str:
+    # Kept with the outputs, so it counts against the workspace quota and expires with them
+    return os.path.join(output_dir, "source")
+
+
+def _update_job(job_dir: str, **fields):
+    """Merge fields into a job record. Only the owning worker writes job.json."""
+    job = load_json_file(_job_file(job_dir))
+    job.update(fields)
+    job['updated_at'] = time.time()
+    save_json_file(_job_file(job_dir), job)
+    return job
+
+
+def _metrics_files(job_dir: str) -> dict:
+    return {
+        'jsonl': os.path.join(job_dir, "metrics.jsonl"),
+        'prometheus': os.path.join(job_dir, "metrics.prom"),
+    }
+
+
+def _source_fingerprint(source) -> str:
+    """Identify a job's input, so the journal never mixes outputs of different inputs."""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return hashlib.sha256(source).hexdigest()
+    return os.path.abspath(source)
+
+
+def run_ingestion_job(job_dir: str, source):
+    """
+    Worker entry point: produce the images and generate audio for a job.
+
+    source is the PDF (source_type 'pdf') or an image folder / ZIP archive
+    (source_type 'images'), as accepted by process_pdf_images and
+    process_image_source respectively. Everything else (words, settings) is
+    read from the job record.
+
+    Runs in a pool process. Progress, partial results and the final state are
+    written to the job record; the cancel flag is checked after every page
+    and every word. Finished pages and words are checkpointed in a journal
+    in the output directory, so running a job again resumes where it stopped.
+
+    If the job collects metrics, every stage is timed; the records of each
+    run are appended to metrics.jsonl in the job directory, the totals of the
+    latest run are written to metrics.prom, and a summary is stored in the
+    job record under 'metrics'.
+    """
+    # Imported here so the Streamlit process does not pay for them on import.
+    from pdf_utils import open_pdf, process_pdf_images, process_image_source
+    from audio_utils import create_audio_files
+    from journal_utils import IngestJournal
+
+    job = load_json_file(_job_file(job_dir))
+    words = job['words']
+    output_dir = job['output_dir']
+    page_words = dict(job['page_words']) if job['page_words'] is not None else None
+
+    images_dir = os.path.join(output_dir, "images")
+    audio_dir = os.path.join(output_dir, "audio")
+    started_at = time.time()
+    _update_job(job_dir, status=RUNNING, stage="pages", started_at=started_at, error=None,
+                images_dir=images_dir, audio_dir=audio_dir)
+    pages_done = []
+    words_done = []
+
+    journal = IngestJournal(os.path.join(output_dir, "journal.jsonl"), {
+        'source': _source_fingerprint(source),
+        'source_type': job['source_type'],
+        'target_width': job['target_width'],
+        'split_cards': job['split_cards'],
+        # Card images are named after words handed out in reading order, and
+        # their page keys carry no word; a changed list must redo every page.
+        'card_words': words if job['split_cards'] else None,
+    })
+
+    if job.get('collect_metrics'):
+        metrics = StageMetrics(labels={'job': job['id']})
+    else:
+        metrics = NULL_METRICS
+
+    def finish(**fields):
+        # Export before the final state, so a finished job always has its metrics.
+        if metrics.enabled:
+            files = _metrics_files(job_dir)
+            metrics.write_jsonl(files['jsonl'], run_started_at=started_at)
+            metrics.write_prometheus(files['prometheus'])
+            fields['metrics'] = metrics.summary()
+        _update_job(job_dir, finished_at=time.time(), **fields)
+
+    def check_cancel():
+        if os.path.exists(_cancel_file(job_dir)):
+            raise JobCancelled()
+
+    def on_page(done, total, output_path):
+        pages_done.append(os.path.basename(output_path))
+        _update_job(job_dir, pages_done=done, pages_total=total, partial_images=pages_done)
+        check_cancel()
+
+    def on_word(done, total, word):
+        words_done.append(word)
+        _update_job(job_dir, words_done=done, words_total=total, partial_words=words_done)
+        check_cancel()
+
+    try:
+        check_cancel()
+        if job['source_type'] == 'images':
+            page_stats = process_image_source(source, images_dir, target_width=job['target_width'],
+                                              words_list=words, progress_callback=on_page,
+                                              journal=journal, metrics=metrics)
+        else:
+            doc = open_pdf(source)
+            try:
+                # Progress counts pages, which only equal the words when there is one word per page
+                _update_job(job_dir, pages_total=len(page_words) if page_words is not None else len(doc))
+                page_stats = process_pdf_images(doc, images_dir, target_width=job['target_width'],
+                                                words_list=words, progress_callback=on_page,
+                                                page_words=page_words, split_cards=job['split_cards'],
+                                                journal=journal, metrics=metrics)
+            finally:
+                doc.close()
+        _update_job(job_dir, stage="audio", page_stats=page_stats)
+        audio_paths = create_audio_files(words, language=job['language'], output_dir=audio_dir,
+                                         progress_callback=on_word, journal=journal, metrics=metrics)
+        failed_words = [word for word, path in audio_paths.items() if path is None]
+        if failed_words:
+            # Leave the job resumable: finished words are in the journal.
+            finish(status=FAILED, error=f"Could not create audio for: {', '.join(failed_words)}")
+        else:
+            finish(status=DONE, stage=None)
+    except JobCancelled:
+        finish(status=CANCELLED)
+    except Exception as e:
+        finish(status=FAILED, error=str(e))
+    return job['id']
+
+
+class JobRunner:
+    """
+    Runs ingestion jobs in a process pool, outside the Streamlit script thread.
+
+    Every job has a directory under root holding job.json (state, progress
+    and partial results) and, once cancellation is requested, a "cancel" flag
+    file. Because the table lives on disk, the UI can poll a job across
+    reruns and sessions.
+    """
+
+    def __init__(self, root: str = None, max_workers: int = 2):
+        self.root = root or default_jobs_root()
+        os.makedirs(self.root, exist_ok=True)
+        self.executor = ProcessPoolExecutor(max_workers=max_workers)
+        self._futures = {}
+        self._mark_orphans()
+
+    def _mark_orphans(self):
+        """Jobs left queued/running by a previous server process can never finish."""
+        for job in self.list_jobs():
+            if job['status'] not in FINISHED_STATES:
+                _update_job(os.path.join(self.root, job['id']), status=INTERRUPTED)
+
+    def submit(self, source, words: list[str], output_dir: str,
+               target_width: int = 200, language: str = 'en', page_words: dict[int, str] = None,
+               split_cards: bool = False, source_type: str = 'pdf', collect_metrics: bool = False,
+               owner: str = None) -> str:
+        """
+        Queue an ingestion job.
+
+        source is PDF bytes/path for source_type 'pdf', or an image folder,
+        ZIP path or ZIP bytes for source_type 'images'. In-memory sources are
+        also kept in output_dir (the job's workspace) so the job can be
+        resumed for as long as the workspace exists.
+
+        If page_words (0-based page index -> word) is given, only those pages
+        are rendered; words should then be its values in page order. With
+        split_cards, every page is cut into cards and words are matched to
+        the cards in reading order.
+
+        With collect_metrics, the job times every pipeline stage (see
+        run_ingestion_job); otherwise the stage hooks are no-ops.
+
+        owner identifies the session that submitted the job (and owns its
+        workspace), so callers can tell their own jobs from other sessions'.
+
+        Returns:
+            str: The new job's id.
+        """
+        job_id = uuid.uuid4().hex[:12]
+        job_dir = os.path.join(self.root, job_id)
+        os.makedirs(job_dir)
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            os.makedirs(output_dir, exist_ok=True)
+            with open(_source_file(output_dir), 'wb') as f:
+                f.write(source)
+            source_path = None
+        else:
+            source_path = os.path.abspath(source)
+        save_json_file(_job_file(job_dir), {
+            'id': job_id,
+            'source_type': source_type,
+            'source_path': source_path,
+            'status': QUEUED,
+            'stage': None,
+            'words': words,
+            'output_dir': output_dir,
+            'target_width': target_width,
+            'language': language,
+            'page_words': sorted(page_words.items()) if page_words is not None else None,
+            'split_cards': split_cards,
+            'collect_metrics': collect_metrics,
+            'owner': owner,
+            'metrics': None,
+            'pages_done': 0,
+            # Without a page selection, split sheets have an unknown page count until the worker opens the PDF
+            'pages_total': len(page_words) if page_words is not None else 0 if split_cards else len(words),
+            'words_done': 0,
+            'words_total': len(words),
+            'partial_images': [],
+            'partial_words': [],
+            'page_stats': [],
+            'error': None,
+            'created_at': time.time(),
+            'updated_at': time.time(),
+        })
+        self._futures[job_id] = self.executor.submit(run_ingestion_job, job_dir, source)
+        return job_id
+
+    def resume(self, job_id: str) -> bool:
+        """
+        Run a cancelled, failed or interrupted job again.
+
+        Pages and words recorded in the job's journal are verified and
+        skipped, so only the unfinished work is redone.
+
+        Returns:
+            bool: True if the job was queued again; False if it can't be
+                resumed, e.g. because its workspace (and stored input) is gone.
+        """
+        job = self.get(job_id)
+        if job is None or job['status'] not in (FAILED, CANCELLED, INTERRUPTED):
+            return False
+        job_dir = os.path.join(self.root, job_id)
+        if job['source_path'] is not None:
+            source = job['source_path']
+        elif os.path.exists(_source_file(job['output_dir'])):
+            with open(_source_file(job['output_dir']), 'rb') as f:
+                source = f.read()
+        else:
+            return False
+        if os.path.exists(_cancel_file(job_dir)):
+            os.unlink(_cancel_file(job_dir))
+        _update_job(job_dir, status=QUEUED, error=None, pages_done=0, words_done=0,
+                    partial_images=[], partial_words=[], metrics=None)
+        self._futures[job_id] = self.executor.submit(run_ingestion_job, job_dir, source)
+        return True
+
+    def get(self, job_id: str) -> dict:
+        """Return the current record of a job, or None if it does not exist."""
+        job_file = _job_file(os.path.join(self.root, job_id))
+        if not os.path.exists(job_file):
+            return None
+        job = load_json_file(job_file)
+        # A worker that crashed hard (e.g. killed) never writes its final state.
+        future = self._futures.get(job_id)
+        if future is not None and future.done() and future.exception() is not None \
+                and job['status'] not in FINISHED_STATES:
+            job = _update_job(os.path.join(self.root, job_id), status=FAILED,
+                              error=str(future.exception()))
+        return job
+
+    def cancel(self, job_id: str):
+        """Request cancellation. Queued jobs stop immediately, running ones after the current unit."""
+        job_dir = os.path.join(self.root, job_id)
+        if not os.path.isdir(job_dir):
+            return
+        open(_cancel_file(job_dir), 'w').close()
+        future = self._futures.get(job_id)
+        if future is not None and future.cancel():
+            _update_job(job_dir, status=CANCELLED, finished_at=time.time())
+
+    def prune(self) -> list[str]:
+        """
+        Delete finished jobs whose output directory no longer exists.
+
+        Outputs live in quota-managed workspaces; once a workspace is
+        released or evicted, its jobs can neither be reviewed nor resumed.
+
+        Returns:
+            list: Ids of the removed jobs.
+        """
+        removed = []
+        for job in self.list_jobs():
+            if job['status'] in FINISHED_STATES and not os.path.isdir(job['output_dir']):
+                shutil.rmtree(os.path.join(self.root, job['id']), ignore_errors=True)
+                self._futures.pop(job['id'], None)
+                removed.append(job['id'])
+        return removed
+
+    def list_jobs(self) -> list[dict]:
+        """All job records, newest first."""
+        jobs = []
+        for name in os.listdir(self.root):
+            job_file = _job_file(os.path.join(self.root, name))
+            if os.path.exists(job_file):
+                jobs.append(load_json_file(job_file))
+        jobs.sort(key=lambda job: job.get('created_at', 0), reverse=True)
+        return jobs
@@ -0,0 +1,93 @@
+import json
+import os
+
+from publish_utils import file_digest
+
+
+class IngestJournal:
+    """
+    Append-only checkpoint journal for an ingestion run.
+
+    Each line records one finished unit of work (a page, an image or a word's
+    audio) with the files it produced and their SHA-256 digests. A restarted
+    run asks is_done() before redoing a unit: the unit is skipped only if all
+    its files still exist with the recorded contents.
+
+    The first line holds the run's context (input digest, settings, ...). If
+    an existing journal was written for a different context it is discarded,
+    so changed inputs or settings never reuse stale outputs.
+    """
+
+    def __init__(self, path: str, context: dict):
+        self.path = path
+        self.context = context
+        self.entries = {}
+        self._load()
+
+    def _load(self):
+        if os.path.exists(self.path):
+            with open(self.path, 'r', encoding='utf-8') as f:
+                lines = f.readlines()
+            header = json.loads(lines[0]) if lines else None
+            if header and header.get('context') == self.context:
+                for line in lines[1:]:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A crash mid-append leaves at most one torn line.
+                        continue
+                    self.entries[entry['key']] = entry
+                return
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({'context': self.context}, ensure_ascii=False) + "\n")
+
+    def is_done(self, key: str) -> bool:
+        """True if the unit was recorded and every file it produced is intact."""
+        entry = self.entries.get(key)
+        if entry is None:
+            return False
+        for output, path in zip(entry['outputs'], self.output_paths(key)):
+            if not os.path.exists(path) or os.path.getsize(path) != output['size'] \
+                    or file_digest(path) != output['sha256']:
+                return False
+        return True
+
+    def get(self, key: str) -> dict:
+        """The recorded entry for a unit, or None."""
+        return self.entries.get(key)
+
+    def record(self, key: str, paths: list[str], **info):
+        """
+        Append a finished unit to the journal.
+
+        Args:
+            key: Identifier of the unit, e.g. "page:3" or "audio:cat".
+            paths: Files the unit produced.
+            **info: Extra JSON-serializable details to keep (e.g. method).
+        """
+        base_dir = os.path.dirname(os.path.abspath(self.path))
+        entry = dict(info)
+        entry['key'] = key
+        entry['outputs'] = [
+            {
+                'path': os.path.relpath(os.path.abspath(path), base_dir),
+                'size': os.path.getsize(path),
+                'sha256': file_digest(path),
+            }
+            for path in paths
+        ]
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.entries[key] = entry
+
+    def output_paths(self, key: str) -> list[str]:
+        """Absolute paths of the files recorded for a unit."""
+        base_dir = os.path.dirname(os.path.abspath(self.path))
+        entry = self.entries.get(key)
+        if entry is None:
+            return []
+        return [os.path.join(base_dir, output['path']) for output in entry['outputs']]
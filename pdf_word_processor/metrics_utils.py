@@ -0,0 +1,189 @@
+import json
+import os
+import tempfile
+import time
+
+
+class _Stage:
+    """Times one stage; the caller may fill in 'bytes' and 'count' on the yielded dict."""
+
+    __slots__ = ('metrics', 'name', 'info', 'start')
+
+    def __init__(self, metrics, name: str, labels: dict):
+        self.metrics = metrics
+        self.name = name
+        self.info = {'bytes': 0, 'count': 1, **labels}
+
+    def __enter__(self) -> dict:
+        self.start = time.perf_counter()
+        return self.info
+
+    def __exit__(self, exc_type, exc, tb):
+        seconds = time.perf_counter() - self.start
+        if exc_type is not None:
+            self.info['error'] = exc_type.__name__
+        self.metrics.record(self.name, seconds, **self.info)
+        return False
+
+
+class _NullStage:
+    """Shared do-nothing stage used while metrics are off."""
+
+    __slots__ = ('info',)
+
+    def __init__(self):
+        self.info = {}
+
+    def __enter__(self) -> dict:
+        return self.info
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+class NullMetrics:
+    """
+    Stand-in for StageMetrics when timings are not collected.
+
+    stage() hands back one shared no-op context manager, so an instrumented
+    stage costs a method call and nothing else.
+    """
+
+    enabled = False
+    _stage = _NullStage()
+
+    def stage(self, name: str, **labels) -> _NullStage:
+        return self._stage
+
+    def record(self, name: str, seconds: float, **info):
+        pass
+
+
+NULL_METRICS = NullMetrics()
+
+
+class StageMetrics:
+    """
+    Records how long each stage of an ingestion run takes.
+
+    Pipeline code wraps each stage in a with-block:
+
+        with metrics.stage("encode", page=3) as info:
+            data = encode(img)
+            info['bytes'] = len(data)
+
+    Every finished stage becomes a record {'stage', 'seconds', 'bytes',
+    'count', ...labels}, kept in memory and passed to each hook (a callable
+    taking the record), e.g. to stream records elsewhere while the run is
+    still going. Records can be exported as JSON lines or as a Prometheus
+    text file, and summarised per stage, page and word.
+    """
+
+    enabled = True
+
+    def __init__(self, labels: dict = None, hooks: list = None):
+        """
+        Args:
+            labels: Labels added to every exported record and metric (e.g. the job id).
+            hooks: Callables invoked with each record as it is made.
+        """
+        self.labels = dict(labels or {})
+        self.hooks = list(hooks or [])
+        self.records = []
+
+    def add_hook(self, hook):
+        self.hooks.append(hook)
+
+    def stage(self, name: str, **labels) -> _Stage:
+        return _Stage(self, name, labels)
+
+    def record(self, name: str, seconds: float, **info):
+        """Record a stage measured elsewhere. info holds 'bytes', 'count' and any labels."""
+        entry = {'stage': name, 'seconds': seconds, 'bytes': 0, 'count': 1, **info}
+        self.records.append(entry)
+        for hook in self.hooks:
+            hook(entry)
+
+    def totals(self) -> dict:
+        """Stage name -> {'seconds', 'bytes', 'count', 'calls'}, in the order stages first ran."""
+        totals = {}
+        for entry in self.records:
+            total = totals.setdefault(entry['stage'], {'seconds': 0.0, 'bytes': 0, 'count': 0, 'calls': 0})
+            total['seconds'] += entry['seconds']
+            total['bytes'] += entry['bytes']
+            total['count'] += entry['count']
+            total['calls'] += 1
+        return totals
+
+    def _slowest(self, label: str, top: int) -> list[dict]:
+        per_item = {}
+        for entry in self.records:
+            if entry.get(label) is not None:
+                item = per_item.setdefault(entry[label], {label: entry[label], 'seconds': 0.0, 'stages': {}})
+                item['seconds'] += entry['seconds']
+                item['stages'][entry['stage']] = item['stages'].get(entry['stage'], 0.0) + entry['seconds']
+        return sorted(per_item.values(), key=lambda item: item['seconds'], reverse=True)[:top]
+
+    def summary(self, top: int = 5) -> dict:
+        """
+        A JSON-serialisable breakdown of the run.
+
+        Returns:
+            dict: 'total_seconds', 'stages' (list of {'stage', 'seconds',
+                'bytes', 'count', 'calls'}, slowest first), and 'slowest_pages'
+                / 'slowest_words' (the top entries by time, each with its
+                per-stage 'stages' split).
+        """
+        stages = [{'stage': name, **total} for name, total in self.totals().items()]
+        stages.sort(key=lambda total: total['seconds'], reverse=True)
+        return {
+            'total_seconds': sum(total['seconds'] for total in stages),
+            'stages': stages,
+            'slowest_pages': self._slowest('page', top),
+            'slowest_words': self._slowest('word', top),
+        }
+
+    def write_jsonl(self, path: str, **fields):
+        """Append every record, plus the common labels and fields, to a JSON-lines file."""
+        with open(path, 'a', encoding='utf-8') as f:
+            for entry in self.records:
+                f.write(json.dumps({**self.labels, **fields, **entry}, ensure_ascii=False) + "\n")
+
+    def write_prometheus(self, path: str, prefix: str = "ingest_stage"):
+        """
+        Write per-stage totals in the Prometheus text format.
+
+        The file is replaced atomically, so it can be picked up by the node
+        exporter's textfile collector while runs are writing it.
+        """
+        lines = []
+        metrics = (
+            ('seconds_total', 'seconds', 'Time spent in the stage.'),
+            ('bytes_total', 'bytes', 'Bytes produced by the stage.'),
+            ('items_total', 'count', 'Items handled by the stage.'),
+            ('calls_total', 'calls', 'Times the stage ran.'),
+        )
+        totals = self.totals()
+        for suffix, key, help_text in metrics:
+            name = f"{prefix}_{suffix}"
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            for stage, total in totals.items():
+                labels = ",".join(f'{k}="{_escape_label(v)}"' for k, v in {**self.labels, 'stage': stage}.items())
+                lines.append(f"{name}{{{labels}}} {total[key]}")
+
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write("\n".join(lines) + "\n")
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+
+def _escape_label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
@@ -3,6 +3,9 @@ import os
 import io
 from PIL import Image, ImageChops
 
+from input_utils import iter_images, list_image_names, word_from_filename
+from metrics_utils import NULL_METRICS
+
 
 def crop_white_border(img: Image.Image) -> Image.Image:
     """
@@ -33,73 +36,605 @@ def crop_white_border(img: Image.Image) -> Image.Image:
         return img
 
 
-def process_pdf_images(pdf_path: str, output_dir: str, target_width: int = 200, words_list: list[str] = None):
+def _content_runs(profile: list[int], min_gap: int, separators: set = frozenset()) -> list[tuple[int, int]]:
+    """
+    Splits a projection profile into (start, end) runs of content.
+
+    Runs are separated by at least min_gap empty entries, or by any entry in
+    separators (e.g. a ruled cutting line) regardless of its width.
+    """
+    runs = []
+    start = last = None
+    for i, value in enumerate(profile):
+        if i in separators:
+            if start is not None:
+                runs.append((start, last + 1))
+                start = None
+            continue
+        if value == 0:
+            continue
+        if start is not None and i - last - 1 >= min_gap:
+            runs.append((start, last + 1))
+            start = None
+        if start is None:
+            start = i
+        last = i
+    if start is not None:
+        runs.append((start, last + 1))
+    return runs
+
+
+def _ruled_lines(counts: list[int], extent: int, line_fraction: float, max_width: int) -> set[int]:
+    """
+    Finds ruled lines in a projection profile.
+
+    A line is a run of at most max_width entries that each cover line_fraction
+    of the content extent, with background on both sides. Wider runs, or
+    runs touching other content, are filled or photo-like cards, not lines.
+    """
+    full = [count >= line_fraction * extent for count in counts]
+    background = line_fraction * extent / 2
+    lines = set()
+    start = 0
+    while start < len(counts):
+        if not full[start]:
+            start += 1
+            continue
+        end = start
+        while end < len(counts) and full[end]:
+            end += 1
+        before = counts[start - 1] if start > 0 else 0
+        after = counts[end] if end < len(counts) else 0
+        if end - start <= max_width and before < background and after < background:
+            lines.update(range(start, end))
+        start = end
+    return lines
+
+
+def detect_card_regions(img: Image.Image, max_dim: int = 400, threshold: int = 40, min_gap: int = 3,
+                        min_size: float = 0.04, line_fraction: float = 0.9,
+                        max_line_width: int = 3) -> list[tuple[int, int, int, int]]:
+    """
+    Finds the individual cards/pictures on a sheet, in reading order.
+
+    Works on a downsampled foreground mask using projection profiles: the page
+    is cut into horizontal bands at empty rows, then each band into cells at
+    empty columns. Ruled grid lines (thin rows/columns whose foreground spans
+    most of the content, with background on both sides) count as separators,
+    so printed cutting lines don't merge cards.
+
+    Args:
+        img: The rendered page.
+        max_dim: The mask is downsampled so its longer side is at most this many pixels.
+        threshold: How much darker than white a pixel must be to count as foreground.
+        min_gap: Minimum empty run (in mask pixels) that separates two cards.
+        min_size: Regions narrower or shorter than this fraction of the page are dropped as noise.
+        line_fraction: A row/column covering at least this fraction of the content
+            extent may be a ruled line.
+        max_line_width: Such rows/columns only count as a ruled line if they form a
+            run at most this many mask pixels wide, flanked by background.
+
+    Returns:
+        list: (left, top, right, bottom) boxes in img coordinates, top-to-bottom,
+            left-to-right. Empty if the page is blank.
+    """
+    # Threshold at full resolution, then downsample: any foreground in a block
+    # keeps the block set, so thin ruled lines survive the reduction.
+    cutoff = 255 - threshold
+    fg = img.convert("L").point(lambda v: 255 if v < cutoff else 0)
+    bbox = fg.getbbox()
+    if not bbox:
+        return []
+    scale = max(fg.size) / max_dim if max(fg.size) > max_dim else 1.0
+    if scale > 1:
+        small_size = (max(1, round(fg.width / scale)), max(1, round(fg.height / scale)))
+        fg = fg.resize(small_size, Image.Resampling.BOX)
+    w, h = fg.size
+    mask = [1 if v else 0 for v in fg.getdata()]
+    left, top, right, bottom = (round(c / scale) for c in bbox)
+
+    # Ruled lines spanning (nearly) the whole content area.
+    row_counts = [sum(mask[y * w:(y + 1) * w]) for y in range(h)]
+    col_counts = [sum(mask[x::w]) for x in range(w)]
+    line_rows = _ruled_lines(row_counts, right - left, line_fraction, max_line_width)
+    line_cols = _ruled_lines(col_counts, bottom - top, line_fraction, max_line_width)
+
+    # Remove vertical lines before profiling rows, so they don't bridge row gaps.
+    if line_cols:
+        row_counts = [
+            row_counts[y] - sum(mask[y * w + x] for x in line_cols) for y in range(h)
+        ]
+
+    boxes = []
+    for y0, y1 in _content_runs(row_counts, min_gap, line_rows):
+        band_cols = [
+            0 if x in line_cols else sum(mask[y * w + x] for y in range(y0, y1))
+            for x in range(w)
+        ]
+        for x0, x1 in _content_runs(band_cols, min_gap, line_cols):
+            if x1 - x0 < min_size * w or y1 - y0 < min_size * h:
+                continue
+            # Tighten the cell vertically to its own content.
+            rows = [y for y in range(y0, y1) if y not in line_rows
+                    and any(mask[y * w + x] for x in range(x0, x1) if x not in line_cols)]
+            if not rows:
+                continue
+            boxes.append((
+                max(0, int(x0 * scale)),
+                max(0, int(rows[0] * scale)),
+                min(img.width, int(x1 * scale + 0.999)),
+                min(img.height, int((rows[-1] + 1) * scale + 0.999)),
+            ))
+    return boxes
+
+
+def _parse_page_range(token: str, page_count: int) -> list[int]:
+    """Parse "7" or "3-9" (1-based, inclusive) into 0-based page indices."""
+    if '-' in token:
+        start_text, end_text = token.split('-', 1)
+        start, end = int(start_text), int(end_text)
+    else:
+        start = end = int(token)
+    if start < 1 or end > page_count or start > end:
+        raise ValueError(f"Page range '{token}' is outside 1-{page_count}")
+    return list(range(start - 1, end))
+
+
+def parse_page_selection(spec: str, page_count: int, words: list[str] = None) -> dict[int, str]:
+    """
+    Parses a page selection into a mapping of 0-based page index to word.
+
+    Supported forms (pages are 1-based):
+        "3:cat, 7:dog"    explicit page-to-word mapping; words is not needed
+        "2-21, 25"        pages/ranges to use; words are assigned in order
+        "!1, !30-32"      every page except the skipped ones; words in order
+
+    Args:
+        spec: The selection text.
+        page_count: Number of pages in the PDF.
+        words: Words to assign to the selected pages (range/skip forms only).
+            Pass None to only select pages; every page then maps to None.
+
+    Returns:
+        dict: Mapping of page index to word, in page order.
+
+    Raises:
+        ValueError: If the selection is malformed or doesn't match the word count.
+    """
+    tokens = [t.strip() for t in spec.split(',') if t.strip()]
+    if not tokens:
+        raise ValueError("Page selection is empty")
+
+    try:
+        if all(':' in t for t in tokens):
+            mapping = {}
+            for token in tokens:
+                page_text, word = token.split(':', 1)
+                if not page_text.strip().isdigit():
+                    raise ValueError(f"Expected a single page number in '{token}'")
+                (page_index,) = _parse_page_range(page_text.strip(), page_count)
+                word = word.strip()
+                if not word:
+                    raise ValueError(f"Missing word for page {page_index + 1}")
+                if page_index in mapping:
+                    raise ValueError(f"Page {page_index + 1} is mapped twice")
+                mapping[page_index] = word
+            return dict(sorted(mapping.items()))
+
+        if any(':' in t for t in tokens):
+            raise ValueError("Don't mix 'page:word' entries with page ranges")
+
+        skips = [t for t in tokens if t.startswith('!')]
+        includes = [t for t in tokens if not t.startswith('!')]
+        selected = set()
+        if includes:
+            for token in includes:
+                selected.update(_parse_page_range(token, page_count))
+        else:
+            selected = set(range(page_count))
+        for token in skips:
+            selected.difference_update(_parse_page_range(token[1:].strip(), page_count))
+    except ValueError as e:
+        # int() failures have unhelpful messages; normalise them.
+        if str(e).startswith("invalid literal"):
+            raise ValueError(f"Could not parse page selection '{spec}'") from e
+        raise
+
+    pages = sorted(selected)
+    if words is None:
+        return {page: None for page in pages}
+    if len(words) != len(pages):
+        raise ValueError(
+            f"Word count ({len(words)}) doesn't match the number of selected pages ({len(pages)})"
+        )
+    return dict(zip(pages, words))
+
+
+def open_pdf(pdf_source) -> fitz.Document:
+    """
+    Opens a PDF from a file path or from in-memory bytes.
+
+    Args:
+        pdf_source: A file path, or the PDF contents as bytes/bytearray/memoryview.
+
+    Returns:
+        The opened PyMuPDF document. The caller is responsible for closing it.
+    """
+    if isinstance(pdf_source, (bytes, bytearray, memoryview)):
+        return fitz.open(stream=bytes(pdf_source), filetype="pdf")
+    return fitz.open(pdf_source)
+
+
+def extract_page_image(doc: fitz.Document, page: fitz.Page, tolerance: float = 2.0) -> Image.Image:
+    """
+    Returns the page's picture straight from its embedded bitmap, if possible.
+
+    This works when the page holds exactly one embedded image, placed once,
+    upright and fully visible on an unrotated page, and any text or vector
+    drawings lie inside it. The original image bytes are decoded, so nothing is lost to
+    rasterizing the page.
+
+    Args:
+        doc: The open document (needed to extract the image stream).
+        page: The page to inspect.
+        tolerance: Slack in points when checking that other content lies inside the image.
+
+    Returns:
+        The image in RGB mode, or None if the page has to be rendered instead.
+    """
+    # /Rotate turns the rendered page, not the image stream.
+    if page.rotation:
+        return None
+    images = page.get_images(full=True)
+    if len(images) != 1:
+        return None
+    xref, smask_xref = images[0][0], images[0][1]
+
+    placements = page.get_image_rects(xref, transform=True)
+    if len(placements) != 1:
+        return None
+    rect, matrix = placements[0]
+    # Rotated, sheared or mirrored placements need the renderer.
+    if abs(matrix.b) > 1e-3 or abs(matrix.c) > 1e-3 or matrix.a <= 0 or matrix.d <= 0:
+        return None
+    if not page.rect.contains(rect):
+        return None
+
+    # Anything drawn outside the image (captions, frames, ...) is part of the page.
+    bounds = fitz.Rect(rect.x0 - tolerance, rect.y0 - tolerance, rect.x1 + tolerance, rect.y1 + tolerance)
+    visible = fitz.Rect(rect.x0 + tolerance, rect.y0 + tolerance, rect.x1 - tolerance, rect.y1 - tolerance)
+    for block in page.get_text("blocks"):
+        if not bounds.contains(fitz.Rect(block[:4])):
+            return None
+    for drawing in page.get_drawings(extended=True):
+        if drawing['type'] == 'clip':
+            # A clipping path that cuts into the image hides part of it.
+            if not fitz.Rect(drawing['scissor']).contains(visible):
+                return None
+        elif not bounds.contains(drawing['rect']):
+            return None
+
+    info = doc.extract_image(xref)
+    # Only grayscale and RGB decode reliably without colour management.
+    if not info or info.get('colorspace') not in (1, 3):
+        return None
+    try:
+        img = Image.open(io.BytesIO(info['image']))
+        img.load()
+    except Exception:
+        return None
+
+    if smask_xref:
+        # Flatten transparency onto white, as the renderer would.
+        mask_info = doc.extract_image(smask_xref)
+        if not mask_info:
+            return None
+        mask = Image.open(io.BytesIO(mask_info['image'])).convert("L")
+        if mask.size != img.size:
+            mask = mask.resize(img.size)
+        background = Image.new("RGB", img.size, (255, 255, 255))
+        background.paste(img.convert("RGB"), mask=mask)
+        return background
+
+    return img.convert("RGB") if img.mode != "RGB" else img
+
+
+def _word_filename(word: str, extension: str) -> str:
+    """Sanitize a word to create a valid filename."""
+    safe_filename = "".join(c for c in word if c.isalnum() or c in (' ', '-', '_')).rstrip()
+    return safe_filename.replace(' ', '_') + extension
+
+
+def _resize_to_width(img: Image.Image, target_width: int) -> Image.Image:
+    """Resize an image to the target width, maintaining aspect ratio."""
+    width, height = img.size
+    aspect_ratio = height / width
+    new_height = int(target_width * aspect_ratio)
+    return img.resize((target_width, new_height), Image.Resampling.LANCZOS)
+
+
+def _to_rgb(img: Image.Image) -> Image.Image:
+    """Convert to RGB, flattening any transparency onto white."""
+    if img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info):
+        img = img.convert("RGBA")
+        background = Image.new("RGB", img.size, (255, 255, 255))
+        background.paste(img, mask=img.getchannel("A"))
+        return background
+    return img.convert("RGB") if img.mode != "RGB" else img
+
+
+def _save_processed_image(img: Image.Image, output_dir: str, filename: str, target_width: int,
+                          metrics=NULL_METRICS, **labels) -> str:
+    """
+    Crop the white border, resize to the target width and save as JPEG. Returns the output path.
+
+    Each step is timed as its own stage on metrics, tagged with labels.
+    """
+    # Crop the white border
+    with metrics.stage("crop", **labels):
+        cropped_image = crop_white_border(img)
+    
+    # Resize the image to the target width, maintaining aspect ratio
+    with metrics.stage("resize", **labels):
+        resized_image = _resize_to_width(cropped_image, target_width)
+    
+    # Encode in memory first, so encoding and disk writes are timed apart
+    with metrics.stage("encode", **labels) as info:
+        buffer = io.BytesIO()
+        resized_image.save(buffer, "JPEG")
+        info['bytes'] = buffer.tell()
+    
+    output_path = os.path.join(output_dir, filename)
+    with metrics.stage("write", **labels) as info:
+        with open(output_path, 'wb') as f:
+            f.write(buffer.getbuffer())
+        info['bytes'] = buffer.tell()
+    print(f"  - Saved processed image to: {output_path}")
+    return output_path
+
+
+def process_pdf_images(pdf_source, output_dir: str, target_width: int = 200, words_list: list[str] = None,
+                       progress_callback=None, page_words: dict[int, str] = None, split_cards: bool = False,
+                       use_embedded: bool = True, journal=None, metrics=NULL_METRICS):
     """
     Extracts page snapshots from each page of a PDF, crops the white border, resizes,
     and saves them as JPEGs.
 
     Args:
-        pdf_path: The file path to the input PDF.
+        pdf_source: The input PDF: a file path, in-memory bytes, or an already
+            opened fitz.Document. A document passed in is left open for the caller.
         output_dir: The directory where processed images will be saved.
         target_width: The desired width of the output images in pixels.
-        words_list: Optional list of words corresponding to each page (one word per page).
+        words_list: Optional list of words corresponding to each page (one word per page),
+            or to each detected card when split_cards is set.
+        progress_callback: Optional callable invoked as
+            progress_callback(pages_done, total_pages, output_path) after each image
+            is saved. It may raise to abort processing (e.g. on cancellation).
+        page_words: Optional mapping of 0-based page index to word (see
+            parse_page_selection). When given, only the mapped pages are
+            rendered and words_list is ignored (except with split_cards, where
+            only the keys are used to select pages).
+        split_cards: If True, each page is treated as a sheet of several cards
+            (see detect_card_regions). Every card becomes its own image, named
+            after the next word of words_list in reading order. If the number of
+            cards found differs from the number of words, ValueError is raised
+            once all pages are done.
+        use_embedded: If True, pages that are just one embedded bitmap are taken
+            from the bitmap directly (see extract_page_image) instead of being
+            rendered. Ignored with split_cards.
+        journal: Optional journal_utils.IngestJournal. Pages it already holds
+            (with intact output files) are skipped; each finished page is recorded.
+        metrics: Optional metrics_utils.StageMetrics. The extract, render,
+            detect, crop, resize, encode and write stages of every page are
+            timed on it, labelled with the 1-based 'page'.
+
+    Returns:
+        list: One stats dict per saved image, in order, with keys 'page'
+            (1-based), 'path' (output file) and 'method' ('embedded', 'rendered',
+            or 'resumed' if taken from the journal).
     """
-    print(f"Starting to process PDF: {pdf_path}")
+    owns_doc = not isinstance(pdf_source, fitz.Document)
+    source_name = pdf_source if isinstance(pdf_source, str) else "<in-memory PDF>"
+    print(f"Starting to process PDF: {source_name}")
     
     # Create the output directory if it doesn't already exist.
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
         print(f"Created output directory: {output_dir}")
 
+    page_stats = []
     try:
-        # Open the PDF file.
-        doc = fitz.open(pdf_path)
+        # Open the PDF, unless the caller handed us an open document.
+        doc = open_pdf(pdf_source) if owns_doc else pdf_source
+        
+        # Without an explicit mapping every page is rendered, named after
+        # the matching entry of words_list (if any).
+        if page_words is None:
+            page_words = {
+                page_num: words_list[page_num] if words_list and page_num < len(words_list) else None
+                for page_num in range(len(doc))
+            }
+        # When splitting sheets, words are handed out per card instead.
+        if split_cards:
+            page_words = dict.fromkeys(page_words)
+        # Index into words_list of the next card's word
+        next_card = 0
+        # Cards found per page (1-based), to check them against the words at the end
+        page_cards = {}
         
-        # Loop through each page of the PDF.
-        for page_num in range(len(doc)):
+        def card_filename(card_index: int, page_num: int, card_num: int) -> str:
+            if words_list and card_index < len(words_list) and words_list[card_index]:
+                return _word_filename(words_list[card_index], ".jpg")
+            return f"page_{page_num + 1}_card_{card_num}.jpg"
+        
+        # Loop through the selected pages of the PDF.
+        for pages_done, (page_num, word) in enumerate(sorted(page_words.items()), start=1):
+            # A sheet's key says which words its cards get: the same page
+            # reached after a different selection gets different words.
+            if split_cards:
+                journal_key = f"page:{page_num}:cards-from:{next_card}"
+            else:
+                journal_key = f"page:{page_num}:{word or ''}"
+            if journal and journal.is_done(journal_key):
+                done_paths = journal.output_paths(journal_key)
+                if split_cards:
+                    expected = [card_filename(next_card + i, page_num, i + 1) for i in range(len(done_paths))]
+                else:
+                    expected = [_word_filename(word, ".jpg") if word else f"page_{page_num + 1}.jpg"]
+                # Only reuse outputs named after the words handed out now
+                if [os.path.basename(path) for path in done_paths] == expected:
+                    print(f"Skipping page {page_num + 1} (already done)")
+                    if split_cards:
+                        next_card += len(done_paths)
+                        page_cards[page_num + 1] = len(done_paths)
+                    for output_path in done_paths:
+                        page_stats.append({'page': page_num + 1, 'path': output_path, 'method': 'resumed'})
+                        if progress_callback:
+                            progress_callback(pages_done, len(page_words), output_path)
+                    continue
+            
             page = doc[page_num]
             
             print(f"Processing page {page_num + 1}...")
             
-            # Render the page as a pixmap at 150 DPI
-            # 150/72 converts DPI to the matrix scale factor (72 is the default DPI)
-            matrix = fitz.Matrix(150/72, 150/72)
-            pix = page.get_pixmap(matrix=matrix)
+            # Fast path: take a lone embedded picture straight from the PDF
+            pil_image = None
+            method = "rendered"
+            if use_embedded and not split_cards:
+                with metrics.stage("extract", page=page_num + 1) as info:
+                    pil_image = extract_page_image(doc, page)
+                    info['count'] = int(pil_image is not None)
+                if pil_image is not None:
+                    method = "embedded"
+                    print("  - Using embedded image")
             
-            # Convert pixmap to PIL Image
-            img_data = pix.tobytes("ppm")
-            pil_image = Image.open(io.BytesIO(img_data))
+            if pil_image is None:
+                with metrics.stage("render", page=page_num + 1) as info:
+                    # Render the page as a pixmap at 150 DPI
+                    # 150/72 converts DPI to the matrix scale factor (72 is the default DPI)
+                    matrix = fitz.Matrix(150/72, 150/72)
+                    pix = page.get_pixmap(matrix=matrix)
+                    
+                    # Convert pixmap to PIL Image
+                    img_data = pix.tobytes("ppm")
+                    info['bytes'] = len(img_data)
+                    pil_image = Image.open(io.BytesIO(img_data))
+                    
+                    # Convert to RGB if needed (pixmaps are typically RGB)
+                    if pil_image.mode != "RGB":
+                        pil_image = pil_image.convert("RGB")
             
-            # Convert to RGB if needed (pixmaps are typically RGB)
-            if pil_image.mode != "RGB":
-                pil_image = pil_image.convert("RGB")
-            
-            # Crop the white border
-            cropped_image = crop_white_border(pil_image)
-            
-            # Resize the image to the target width, maintaining aspect ratio
-            width, height = cropped_image.size
-            aspect_ratio = height / width
-            new_height = int(target_width * aspect_ratio)
-            resized_image = cropped_image.resize((target_width, new_height), Image.Resampling.LANCZOS)
-            
-            # Save the final image as a JPEG
-            if words_list and page_num < len(words_list):
-                # Sanitize the word to create a valid filename
-                word = words_list[page_num]
-                safe_filename = "".join(c for c in word if c.isalnum() or c in (' ', '-', '_')).rstrip()
-                safe_filename = safe_filename.replace(' ', '_') + ".jpg"
+            if split_cards:
+                # One image per detected card, matched to the words in reading order
+                with metrics.stage("detect", page=page_num + 1) as info:
+                    regions = detect_card_regions(pil_image)
+                    info['count'] = len(regions)
+                print(f"  - Found {len(regions)} card(s)")
+                page_cards[page_num + 1] = len(regions)
+                cards = []
+                for card_num, box in enumerate(regions, start=1):
+                    cards.append((pil_image.crop(box), card_filename(next_card, page_num, card_num)))
+                    next_card += 1
             else:
-                safe_filename = f"page_{page_num + 1}.jpg"
+                if word:
+                    safe_filename = _word_filename(word, ".jpg")
+                else:
+                    safe_filename = f"page_{page_num + 1}.jpg"
+                cards = [(pil_image, safe_filename)]
             
-            output_path = os.path.join(output_dir, safe_filename)
-            resized_image.save(output_path, "JPEG")
-            print(f"  - Saved processed image to: {output_path}")
+            page_paths = []
+            for card_image, safe_filename in cards:
+                output_path = _save_processed_image(card_image, output_dir, safe_filename, target_width,
+                                                    metrics, page=page_num + 1)
+                page_paths.append(output_path)
+                page_stats.append({'page': page_num + 1, 'path': output_path, 'method': method})
+                
+                if progress_callback:
+                    progress_callback(pages_done, len(page_words), output_path)
+            
+            if journal:
+                journal.record(journal_key, page_paths, method=method)
 
-        doc.close()
+        if owns_doc:
+            doc.close()
+        
+        # Words are handed out in order, so a page with missing or extra cards
+        # shifts every later name; refuse the whole run instead.
+        if split_cards and words_list and sum(page_cards.values()) != len(words_list):
+            counts = ", ".join(f"page {page}: {count}" for page, count in sorted(page_cards.items()))
+            raise ValueError(
+                f"Found {sum(page_cards.values())} card(s) but {len(words_list)} word(s), so images "
+                f"would be named after the wrong words (cards per page: {counts})"
+            )
         print("\nProcessing complete! ✨")
+        return page_stats
         
     except Exception as e:
         print(f"An error occurred: {e}")
         raise
 
+
+def process_image_source(source, output_dir: str, target_width: int = 200, words_list: list[str] = None,
+                         progress_callback=None, journal=None, metrics=NULL_METRICS):
+    """
+    Runs the crop/resize/save pipeline over a folder of images or a ZIP archive.
+
+    Args:
+        source: A directory path, a ZIP file path, or ZIP contents as bytes
+            (see input_utils.iter_images). ZIP members are streamed, not extracted.
+        output_dir: The directory where processed images will be saved.
+        target_width: The desired width of the output images in pixels.
+        words_list: Optional list of words, one per image in name order. By
+            default each image's word comes from its file name.
+        progress_callback: Optional callable invoked as
+            progress_callback(images_done, total_images, output_path) after each
+            image is saved. It may raise to abort processing.
+        journal: Optional journal_utils.IngestJournal used to skip images
+            finished by an earlier run (see process_pdf_images).
+        metrics: Optional metrics_utils.StageMetrics timing the decode, crop,
+            resize, encode and write stages of every image (see process_pdf_images).
+
+    Returns:
+        list: One stats dict per saved image (see process_pdf_images), with
+            'page' the 1-based image number and 'method' set to 'image' (or
+            'resumed' if taken from the journal).
+    """
+    print("Starting to process images")
+    os.makedirs(output_dir, exist_ok=True)
+
+    names = list_image_names(source)
+    words = [
+        words_list[i] if words_list and i < len(words_list) else word_from_filename(name)
+        for i, name in enumerate(names)
+    ]
+    journal_keys = [f"image:{name}:{word}" for name, word in zip(names, words)]
+    
+    # Resumed images are not even decoded; only the remaining ones are streamed
+    remaining = {
+        name for name, key in zip(names, journal_keys)
+        if not (journal and journal.is_done(key))
+    }
+    images = iter_images(source, only=remaining)
+    
+    page_stats = []
+    for image_num, (name, word, journal_key) in enumerate(zip(names, words, journal_keys), start=1):
+        if name not in remaining:
+            print(f"Skipping image {image_num}: {name} (already done)")
+            output_path = journal.output_paths(journal_key)[0]
+            page_stats.append({'page': image_num, 'path': output_path, 'method': 'resumed'})
+        else:
+            with metrics.stage("decode", page=image_num):
+                _, img = next(images)
+                img = _to_rgb(img)
+            print(f"Processing image {image_num}: {name}")
+            output_path = _save_processed_image(img, output_dir, _word_filename(word, ".jpg"), target_width,
+                                                metrics, page=image_num)
+            page_stats.append({'page': image_num, 'path': output_path, 'method': 'image'})
+            if journal:
+                journal.record(journal_key, [output_path], method='image')
+        
+        if progress_callback:
+            progress_callback(image_num, len(names), output_path)
+    
+    print("\nProcessing complete! ✨")
+    return page_stats
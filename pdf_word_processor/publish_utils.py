@@ -0,0 +1,141 @@
+import hashlib
+import os
+import shutil
+import sys
+import tempfile
+
+try:
+    import fcntl
+except ImportError:  # Windows has no fcntl; reflinks are skipped there.
+    fcntl = None
+
+
+# Linux ioctl that clones a file's extents (btrfs, XFS, ...).
+FICLONE = 0x40049409
+
+CREATED = "created"
+OVERWRITTEN = "overwritten"
+UNCHANGED = "unchanged"
+MISSING = "missing"
+
+
+def file_digest(path: str, chunk_size: int = 1 << 20) -> str:
+    """Return the SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _stat_signature(path: str):
+    """Cheap change detector: (size, mtime_ns), or None if the file is gone."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_size, st.st_mtime_ns)
+
+
+def _try_reflink(src: str, tmp_dst: str) -> bool:
+    """Clone src into tmp_dst with a copy-on-write reflink, if supported."""
+    if fcntl is None or not sys.platform.startswith('linux'):
+        return False
+    try:
+        with open(src, 'rb') as s, open(tmp_dst, 'wb') as d:
+            fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+        return True
+    except OSError:
+        return False
+
+
+def _place_file(src: str, dst: str) -> str:
+    """
+    Put the contents of src at dst atomically.
+
+    Tries a reflink, then falls back to a plain copy. Returns the method that
+    was used. Both leave dst independent of src: the pipeline rewrites its
+    workspace outputs in place, which must never change published files, so
+    hardlinks are not used.
+    """
+    dst_dir = os.path.dirname(os.path.abspath(dst))
+    fd, tmp_dst = tempfile.mkstemp(dir=dst_dir, prefix=".", suffix=".publish")
+    os.close(fd)
+    try:
+        if _try_reflink(src, tmp_dst):
+            method = "reflink"
+        else:
+            shutil.copy2(src, tmp_dst)
+            method = "copy"
+        os.replace(tmp_dst, dst)
+    except BaseException:
+        if os.path.exists(tmp_dst):
+            os.unlink(tmp_dst)
+        raise
+    return method
+
+
+def publish_file(src: str, dst: str, record: dict = None) -> dict:
+    """
+    Publish a single file, skipping the write when dst already has the same content.
+
+    Args:
+        src: Path of the file to publish.
+        dst: Destination path.
+        record: Optional dict of earlier publishes (see publish_files). When
+            both files are unchanged since the recorded publish, no hashing
+            is done at all.
+
+    Returns:
+        dict: 'src', 'dst', 'status' (CREATED, OVERWRITTEN, UNCHANGED or
+            MISSING), 'method' (reflink or copy, or None if nothing was
+            written), 'size' and 'old_size' (None if dst did not exist).
+    """
+    src, dst = str(src), str(dst)
+    result = {'src': src, 'dst': dst, 'status': MISSING, 'method': None,
+              'size': None, 'old_size': None}
+
+    src_sig = _stat_signature(src)
+    if src_sig is None:
+        return result
+    dst_sig = _stat_signature(dst)
+    result['size'] = src_sig[0]
+    result['old_size'] = dst_sig[0] if dst_sig else None
+
+    previous = record.get(dst) if record is not None else None
+    if previous and previous['src'] == src and previous['src_sig'] == src_sig \
+            and previous['dst_sig'] == dst_sig:
+        result['status'] = UNCHANGED
+        return result
+
+    src_hash = file_digest(src)
+    if dst_sig is not None and dst_sig[0] == src_sig[0] and file_digest(dst) == src_hash:
+        result['status'] = UNCHANGED
+    else:
+        result['method'] = _place_file(src, dst)
+        result['status'] = OVERWRITTEN if dst_sig is not None else CREATED
+        dst_sig = _stat_signature(dst)
+
+    if record is not None:
+        record[dst] = {'src': src, 'src_sig': src_sig, 'dst_sig': dst_sig,
+                       'digest': src_hash}
+    return result
+
+
+def publish_files(pairs: list, record: dict = None) -> list[dict]:
+    """
+    Publish many (src, dst) pairs.
+
+    Args:
+        pairs: Iterable of (src, dst) path pairs.
+        record: Optional dict that remembers what has been published. Pass
+            the same dict to later calls to make re-publishing a no-op.
+
+    Returns:
+        list: One result dict per pair (see publish_file).
+    """
+    results = []
+    for src, dst in pairs:
+        os.makedirs(os.path.dirname(os.path.abspath(str(dst))), exist_ok=True)
+        results.append(publish_file(src, dst, record))
+    return results
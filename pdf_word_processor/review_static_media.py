@@ -7,13 +7,14 @@ import sys
 # Add current directory to path for imports
 sys.path.insert(0, os.path.dirname(__file__))
 
-from audio_utils import create_audio_files
+# audio_utils (gTTS) is imported only when audio is actually created.
 
 
 # Set page config
 st.set_page_config(page_title="Review Static Media", layout="wide")
 
 
+@st.cache_resource
 def get_project_root():
     """Get the project root directory (two levels up from this file)."""
     return Path(__file__).parent.parent
@@ -25,8 +26,14 @@ def sanitize_filename(word: str) -> str:
     return safe.replace(' ', '_')
 
 
+@st.cache_data
 def get_image_audio_pairs():
-    """Get all image/audio pairs from shared/static directories."""
+    """
+    Get all image/audio pairs from shared/static directories.
+
+    Cached across reruns; call get_image_audio_pairs.clear() after changing
+    the files (the Refresh button does the same).
+    """
     project_root = get_project_root()
     images_dir = project_root / "shared" / "static" / "images"
     audio_dir = project_root / "shared" / "static" / "audio"
@@ -59,6 +66,13 @@ def get_image_audio_pairs():
     return pairs
 
 
+@st.cache_data(max_entries=200)
+def read_media_bytes(path: str, mtime_ns: int) -> bytes:
+    """File contents, cached per path and modification time so a rewritten file is read again."""
+    with open(path, "rb") as f:
+        return f.read()
+
+
 def rename_file(old_path: Path, new_name: str, extension: str) -> Path:
     """Rename a file to a new name with the given extension."""
     new_path = old_path.parent / f"{new_name}.{extension}"
@@ -68,9 +82,6 @@ def rename_file(old_path: Path, new_name: str, extension: str) -> Path:
 
 
 # Initialize session state
-if 'pairs' not in st.session_state:
-    st.session_state.pairs = get_image_audio_pairs()
-
 if 'mismatches' not in st.session_state:
     st.session_state.mismatches = {}
 
@@ -85,7 +96,7 @@ st.title("Review Static Audio & Image Matching")
 st.markdown("Review image and audio pairs. Mark mismatches and fix them.")
 
 # Get all pairs
-pairs = st.session_state.pairs
+pairs = get_image_audio_pairs()
 total_items = len(pairs)
 items_per_page = 20
 total_pages = (total_items + items_per_page - 1) // items_per_page if total_items > 0 else 1
@@ -111,7 +122,7 @@ with col3:
 
 with col4:
     if st.button("🔄 Refresh List"):
-        st.session_state.pairs = get_image_audio_pairs()
+        get_image_audio_pairs.clear()
         st.rerun()
 
 # Calculate page range
@@ -139,16 +150,14 @@ for idx, pair in enumerate(page_pairs):
         with col1:
             st.subheader(f"{global_idx + 1}. {name}")
             if os.path.exists(image_path):
-                st.image(str(image_path), caption=name, width=200)
+                st.image(read_media_bytes(str(image_path), os.stat(image_path).st_mtime_ns), caption=name, width=200)
             else:
                 st.error(f"Image not found: {image_path}")
         
         with col2:
             st.markdown("### Audio")
             if os.path.exists(audio_path):
-                with open(audio_path, "rb") as audio_file:
-                    audio_bytes = audio_file.read()
-                st.audio(audio_bytes, format='audio/mp3')
+                st.audio(read_media_bytes(str(audio_path), os.stat(audio_path).st_mtime_ns), format='audio/mp3')
             else:
                 st.error(f"Audio not found: {audio_path}")
         
@@ -207,6 +216,8 @@ for idx, pair in enumerate(page_pairs):
                                 else:
                                     with st.spinner("Renaming files and creating new audio..."):
                                         try:
+                                            from audio_utils import create_audio_files
+                                            
                                             # Rename image
                                             old_image_path = images_dir / f"{name}.jpg"
                                             
@@ -242,7 +253,7 @@ for idx, pair in enumerate(page_pairs):
                                             st.session_state.editing_item = None
                                             
                                             # Refresh pairs list
-                                            st.session_state.pairs = get_image_audio_pairs()
+                                            get_image_audio_pairs.clear()
                                             
                                             st.rerun()
                                             
@@ -262,6 +273,8 @@ for idx, pair in enumerate(page_pairs):
                         
                         with st.spinner("Recreating audio file..."):
                             try:
+                                from audio_utils import create_audio_files
+                                
                                 # Recreate audio using the original name
                                 create_audio_files(
                                     [name],
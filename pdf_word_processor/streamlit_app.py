@@ -1,16 +1,20 @@
 import streamlit as st
 import os
-import json
-import shutil
-import tempfile
+import time
 import sys
+import uuid
+import zipfile
 from pathlib import Path
 
 # Add current directory to path for imports
 sys.path.insert(0, os.path.dirname(__file__))
 
-from pdf_utils import process_pdf_images
-from audio_utils import create_audio_files
+# pdf_utils (PyMuPDF) and input_utils (Pillow) are imported where a file is
+# processed, so page loads and reruns don't pay for them.
+from job_runner import JobRunner, QUEUED, RUNNING, DONE, FAILED, CANCELLED, INTERRUPTED, FINISHED_STATES
+from config_utils import load_json_file, merge_words_into_configs, WEIGHTED, PLAIN
+from publish_utils import publish_file, OVERWRITTEN, UNCHANGED, MISSING
+from workspace_utils import WorkspaceManager
 
 
 # Set page config
@@ -23,6 +27,52 @@ if 'accepted_words' not in st.session_state:
     st.session_state.accepted_words = []
 if 'temp_dir' not in st.session_state:
     st.session_state.temp_dir = None
+if 'workspace_owner' not in st.session_state:
+    # Sessions uploading the same file still get separate workspaces
+    st.session_state.workspace_owner = uuid.uuid4().hex[:8]
+if 'publish_record' not in st.session_state:
+    st.session_state.publish_record = {}
+if 'job_id' not in st.session_state:
+    st.session_state.job_id = None
+
+
+@st.cache_resource
+def get_job_runner() -> JobRunner:
+    """One job runner (and process pool) shared by every session on this server."""
+    return JobRunner()
+
+
+@st.cache_resource
+def get_workspace_manager() -> WorkspaceManager:
+    """Session workspaces: 2 GB in total, unused ones are removed after a day; any used in the last hour are kept."""
+    return WorkspaceManager(quota_bytes=2 * 1024 ** 3, ttl_seconds=24 * 3600)
+
+
+@st.cache_data(ttl=2)
+def list_job_records() -> list[dict]:
+    """The job table. Kept for a moment so reruns in quick succession share one read; cleared on changes."""
+    return get_job_runner().list_jobs()
+
+
+@st.cache_data(ttl=60)
+def get_workspace_usage() -> dict:
+    """Workspace disk usage; walking every workspace is too slow for each rerun. Cleared on changes."""
+    return get_workspace_manager().usage()
+
+
+@st.cache_data(max_entries=200)
+def read_media_bytes(path: str, mtime_ns: int) -> bytes:
+    """File contents, cached per path and modification time so a rewritten file is read again."""
+    with open(path, "rb") as f:
+        return f.read()
+
+
+@st.cache_data
+def load_config_groups(config_file: str) -> list[str]:
+    """Group names of a game's JSON config (empty if it is missing). Cleared after the configs are updated."""
+    if not os.path.exists(config_file):
+        return []
+    return list(load_json_file(config_file))
 
 
 def sanitize_filename(word: str) -> str:
@@ -31,6 +81,7 @@ def sanitize_filename(word: str) -> str:
     return safe.replace(' ', '_')
 
 
+@st.cache_resource
 def get_project_root():
     """Get the project root directory (two levels up from this file)."""
     return Path(__file__).parent.parent
@@ -46,75 +97,325 @@ def get_relative_path(path: Path) -> str:
         return str(path)
 
 
-def load_json_file(filepath: str) -> dict:
-    """Load a JSON file."""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        return json.load(f)
+def publish_word_media(words: list[str], images_dir: str, audio_dir: str):
+    """
+    Publish the image and audio of each word to shared/static.
 
+    Identical files are skipped, and everything published is remembered in
+    st.session_state.publish_record so publishing again is a no-op.
 
-def save_json_file(filepath: str, data: dict):
-    """Save data to a JSON file."""
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    Returns:
+        tuple: (saved_images, saved_audio, log_messages)
+    """
+    project_root = get_project_root()
+    shared_images_dir = project_root / "shared" / "static" / "images"
+    shared_audio_dir = project_root / "shared" / "static" / "audio"
+    shared_images_dir.mkdir(parents=True, exist_ok=True)
+    shared_audio_dir.mkdir(parents=True, exist_ok=True)
+    
+    pairs = []
+    kinds = []
+    for word in words:
+        image_filename = sanitize_filename(word) + ".jpg"
+        pairs.append((os.path.join(images_dir, image_filename), shared_images_dir / image_filename))
+        kinds.append("Image")
+        audio_filename = sanitize_filename(word) + ".mp3"
+        pairs.append((os.path.join(audio_dir, audio_filename), shared_audio_dir / audio_filename))
+        kinds.append("Audio")
+    
+    saved = {"Image": 0, "Audio": 0}
+    log_messages = []
+    for kind, (src, dst) in zip(kinds, pairs):
+        rel_dst = get_relative_path(Path(dst))
+        try:
+            result = publish_file(src, dst, st.session_state.publish_record)
+        except Exception as e:
+            log_messages.append(f"❌ ERROR saving {kind.lower()} `{rel_dst}`: {e}")
+            continue
+        
+        status = result['status']
+        if status == MISSING:
+            log_messages.append(f"⚠️ Source {kind.lower()} not found: `{src}`")
+        elif status == UNCHANGED:
+            saved[kind] += 1
+            log_messages.append(f"⏭️ UNCHANGED {kind}: `{rel_dst}` ({result['size']} bytes)")
+        else:
+            saved[kind] += 1
+            label = "✅ OVERWRITTEN" if status == OVERWRITTEN else "✅ CREATED"
+            log_msg = f"{label} {kind}: `{rel_dst}`"
+            if status == OVERWRITTEN:
+                log_msg += f" (old: {result['old_size']} bytes → new: {result['size']} bytes, {result['method']})"
+            else:
+                log_msg += f" ({result['size']} bytes, {result['method']})"
+            log_messages.append(log_msg)
+    
+    return saved["Image"], saved["Audio"], log_messages
 
 
 st.title("PDF Word Processor")
-st.markdown("Upload a PDF and provide words to generate images and audio files.")
+st.markdown("Upload a PDF (or a ZIP of images) and provide words to generate images and audio files.")
 
 # Main processing interface
 with st.form("pdf_upload_form"):
-    uploaded_pdf = st.file_uploader("Upload PDF File", type=['pdf'])
+    uploaded_file = st.file_uploader("Upload PDF File or ZIP of Images", type=['pdf', 'zip'])
     words_input = st.text_input(
-        "Enter words (comma-separated, one word per page)",
-        placeholder="word1, word2, word3, ..."
+        "Enter words (comma-separated, one word per page or image)",
+        placeholder="word1, word2, word3, ...",
+        help="For a ZIP, leave empty to use the image file names as words."
+    )
+    pages_input = st.text_input(
+        "Pages to use (optional, PDF only)",
+        placeholder="e.g. 2-21  or  !1, !30-32  or  3:cat, 7:dog",
+        help="Leave empty to use every page. Ranges select pages and skips (!) drop them; "
+             "the words above are assigned to the selected pages in order. "
+             "'page:word' entries map pages to words directly, and the word list can be left empty."
+    )
+    split_cards = st.checkbox(
+        "Several cards per page (PDF only)",
+        help="For flashcard sheets: each picture on a page becomes its own image. "
+             "Words are matched to the pictures in reading order (left to right, top to bottom)."
     )
-    process_button = st.form_submit_button("Process PDF")
+    collect_metrics = st.checkbox(
+        "Record stage timings",
+        value=True,
+        help="Time rendering, cropping, resizing, encoding, disk writes and text-to-speech "
+             "for every page and word, and show the breakdown after processing."
+    )
+    process_button = st.form_submit_button("Process")
 
     if process_button:
-        if uploaded_pdf is None:
-            st.error("Please upload a PDF file.")
-        elif not words_input.strip():
+        is_zip = uploaded_file is not None and uploaded_file.name.lower().endswith('.zip')
+        
+        if uploaded_file is None:
+            st.error("Please upload a PDF or ZIP file.")
+        elif not is_zip and not words_input.strip() and ':' not in pages_input:
             st.error("Please enter a list of words.")
-        else:
-            # Parse words
+        elif is_zip and (pages_input.strip() or split_cards):
+            st.error("Page selection and card splitting only apply to PDFs.")
+        elif is_zip:
+            from input_utils import list_image_names, word_from_filename
+            
+            # Parse words, defaulting to the image file names
             words = [w.strip() for w in words_input.split(',') if w.strip()]
+            try:
+                image_names = list_image_names(uploaded_file.getvalue())
+            except zipfile.BadZipFile:
+                image_names = None
             
-            # Create temporary directory
-            temp_dir = tempfile.mkdtemp()
-            st.session_state.temp_dir = temp_dir
+            if image_names is None:
+                st.error("The uploaded file is not a valid ZIP archive.")
+            elif not image_names:
+                st.error("No images found in the ZIP archive.")
+            elif words and len(words) != len(image_names):
+                st.error(f"Word count ({len(words)}) doesn't match image count ({len(image_names)}). "
+                         f"Provide exactly {len(image_names)} words, or leave the field empty to use file names.")
+            else:
+                words = words or [word_from_filename(name) for name in image_names]
+                
+                # Re-uploading the same archive in this session reuses its workspace
+                temp_dir = get_workspace_manager().acquire(
+                    uploaded_file.getvalue(), label=uploaded_file.name, owner=st.session_state.workspace_owner
+                )
+                st.session_state.temp_dir = temp_dir
+                get_workspace_usage.clear()
+                
+                # Stream the images out of the archive in the background job runner
+                st.session_state.job_id = get_job_runner().submit(
+                    uploaded_file.getvalue(), words, temp_dir, target_width=200, language='en',
+                    source_type='images', collect_metrics=collect_metrics,
+                    owner=st.session_state.workspace_owner
+                )
+                st.session_state.processed_data = None
+                list_job_records.clear()
+                st.rerun()
+        else:
+            from pdf_utils import open_pdf, parse_page_selection
             
-            # Save uploaded PDF to temp directory
-            pdf_path = os.path.join(temp_dir, "input.pdf")
-            with open(pdf_path, "wb") as f:
-                f.write(uploaded_pdf.getbuffer())
+            # Parse words
+            words = [w.strip() for w in words_input.split(',') if w.strip()]
             
-            # Count pages in PDF
-            import fitz
-            doc = fitz.open(pdf_path)
+            # Count pages straight from memory; no temp copy of the PDF is written.
+            doc = open_pdf(uploaded_file.getvalue())
             page_count = len(doc)
             doc.close()
             
-            if len(words) != page_count:
-                st.error(f"Word count ({len(words)}) doesn't match page count ({page_count}). Please provide exactly {page_count} words.")
+            page_words = None
+            selection_error = None
+            if pages_input.strip():
+                try:
+                    if split_cards:
+                        if ':' in pages_input:
+                            raise ValueError("'page:word' entries can't be combined with several cards per page")
+                        page_words = parse_page_selection(pages_input, page_count)
+                    else:
+                        page_words = parse_page_selection(pages_input, page_count, words)
+                        words = list(page_words.values())
+                except ValueError as e:
+                    selection_error = str(e)
+            
+            if selection_error:
+                st.error(f"Invalid page selection: {selection_error}")
+            elif split_cards and not words:
+                st.error("Please enter a list of words.")
+            elif page_words is None and not split_cards and len(words) != page_count:
+                st.error(f"Word count ({len(words)}) doesn't match page count ({page_count}). Please provide exactly {page_count} words, or choose pages to use.")
             else:
-                with st.spinner("Processing PDF pages..."):
-                    # Process images
-                    images_dir = os.path.join(temp_dir, "images")
-                    process_pdf_images(pdf_path, images_dir, target_width=200, words_list=words)
-                
-                with st.spinner("Generating audio files..."):
-                    # Generate audio
-                    audio_dir = os.path.join(temp_dir, "audio")
-                    create_audio_files(words, language='en', output_dir=audio_dir)
+                # Re-uploading the same PDF in this session reuses its workspace,
+                # and the journal there skips finished pages
+                temp_dir = get_workspace_manager().acquire(
+                    uploaded_file.getvalue(), label=uploaded_file.name, owner=st.session_state.workspace_owner
+                )
+                st.session_state.temp_dir = temp_dir
+                get_workspace_usage.clear()
                 
-                # Store processed data
-                st.session_state.processed_data = {
-                    'words': words,
-                    'images_dir': images_dir,
-                    'audio_dir': audio_dir
+                # Render pages and generate audio in the background job runner
+                st.session_state.job_id = get_job_runner().submit(
+                    uploaded_file.getvalue(), words, temp_dir, target_width=200, language='en',
+                    page_words=page_words, split_cards=split_cards, collect_metrics=collect_metrics,
+                    owner=st.session_state.workspace_owner
+                )
+                st.session_state.processed_data = None
+                list_job_records.clear()
+                st.rerun()
+
+# Job table
+with st.sidebar:
+    st.subheader("Recent Jobs")
+    all_jobs = list_job_records()
+    recent_jobs = all_jobs[:10]
+    if recent_jobs:
+        st.dataframe(
+            [
+                {
+                    'job': job['id'],
+                    'status': job['status'],
+                    'pages': f"{job['pages_done']}/{job['pages_total']}",
+                    'audio': f"{job['words_done']}/{job['words_total']}",
                 }
-                
-                st.success(f"Processed {len(words)} pages successfully!")
+                for job in recent_jobs
+            ],
+            hide_index=True,
+            use_container_width=True
+        )
+    else:
+        st.caption("No jobs yet.")
+    
+    # This session's failed or cancelled jobs can be picked up again, and so can
+    # jobs interrupted by a server restart (their sessions are gone with it)
+    resumable_jobs = [
+        job for job in all_jobs
+        if job['status'] == INTERRUPTED
+        or job['status'] in (FAILED, CANCELLED) and job.get('owner') == st.session_state.workspace_owner
+    ][:10]
+    if resumable_jobs and not st.session_state.job_id:
+        resume_id = st.selectbox(
+            "Resume a job:",
+            [job['id'] for job in resumable_jobs],
+            format_func=lambda job_id: next(
+                f"{job['id']} ({job['status']}, {job['words_total']} words)" for job in resumable_jobs if job['id'] == job_id
+            )
+        )
+        if st.button("▶ Resume Job"):
+            job = get_job_runner().get(resume_id)
+            if get_job_runner().resume(resume_id):
+                st.session_state.job_id = resume_id
+                st.session_state.temp_dir = job['output_dir']
+                st.session_state.processed_data = None
+                list_job_records.clear()
+                st.rerun()
+            else:
+                st.error("This job can't be resumed; its workspace has been removed. Upload the file again.")
+    
+    # Workspace disk usage; expired and least recently used workspaces are evicted
+    workspaces = get_workspace_manager()
+    if st.session_state.temp_dir:
+        workspaces.touch(st.session_state.temp_dir)
+    if workspaces.cleanup(protected={st.session_state.temp_dir} | {
+        job['output_dir'] for job in all_jobs if job['status'] not in FINISHED_STATES
+    }):
+        # Jobs whose workspace was evicted can't be reviewed or resumed any more
+        get_job_runner().prune()
+        list_job_records.clear()
+        get_workspace_usage.clear()
+    usage = get_workspace_usage()
+    st.subheader("Workspace Usage")
+    st.progress(min(usage['total_bytes'] / usage['quota_bytes'], 1.0))
+    st.caption(f"{usage['total_bytes'] / 1024 ** 2:.1f} MB of {usage['quota_bytes'] / 1024 ** 2:.0f} MB "
+               f"in {len(usage['workspaces'])} workspace(s); unused ones expire after "
+               f"{usage['ttl_seconds'] // 3600} h")
+    if usage['workspaces']:
+        with st.expander("Workspaces"):
+            st.dataframe(
+                [
+                    {
+                        'input': workspace.get('label', workspace['key']),
+                        'size (MB)': round(workspace['size'] / 1024 ** 2, 1),
+                        'idle (min)': int((time.time() - workspace['last_used']) // 60),
+                        'current': workspace['path'] == st.session_state.temp_dir,
+                    }
+                    for workspace in reversed(usage['workspaces'])
+                ],
+                hide_index=True,
+                use_container_width=True
+            )
+
+# Background job progress
+if st.session_state.job_id:
+    runner = get_job_runner()
+    job = runner.get(st.session_state.job_id)
+    
+    if job is None:
+        st.session_state.job_id = None
+    elif job['status'] in (QUEUED, RUNNING):
+        st.header("Processing")
+        pages_total = max(job['pages_total'], 1)
+        words_total = max(job['words_total'], 1)
+        st.progress(job['pages_done'] / pages_total, text=f"Pages rendered: {job['pages_done']}/{job['pages_total']}")
+        st.progress(job['words_done'] / words_total, text=f"Audio generated: {job['words_done']}/{job['words_total']}")
+        
+        if job['partial_images']:
+            with st.expander(f"Partial results ({len(job['partial_images'])} image(s))"):
+                cols = st.columns(6)
+                for idx, image_filename in enumerate(job['partial_images'][-12:]):
+                    cols[idx % 6].image(os.path.join(job['images_dir'], image_filename), width=100)
+        
+        if st.button("⛔ Cancel Processing"):
+            runner.cancel(st.session_state.job_id)
+            list_job_records.clear()
+            st.rerun()
+        
+        # Poll the job table again shortly
+        time.sleep(1)
+        st.rerun()
+    elif job['status'] == DONE:
+        st.session_state.processed_data = {
+            'words': job['words'],
+            'images_dir': job['images_dir'],
+            'audio_dir': job['audio_dir'],
+            'page_stats': job['page_stats'],
+            'metrics': job.get('metrics')
+        }
+        st.session_state.job_id = None
+        # The finished job changed the job table and filled its workspace
+        list_job_records.clear()
+        get_workspace_usage.clear()
+        st.success(f"Processed {len(job['words'])} pages successfully!")
+        st.rerun()
+    else:
+        message = f"Processing {job['status']}"
+        if job['error']:
+            message += f": {job['error']}"
+        st.error(message)
+        col1, col2 = st.columns([1, 1])
+        with col1:
+            if st.button("▶ Resume", help="Finished pages and words are kept; only the rest is redone."):
+                if runner.resume(st.session_state.job_id):
+                    list_job_records.clear()
+                    st.rerun()
+                st.error("This job can't be resumed; its workspace has been removed. Upload the file again.")
+        with col2:
+            if st.button("Dismiss"):
+                st.session_state.job_id = None
                 st.rerun()
 
 # Review interface
@@ -126,6 +427,74 @@ if st.session_state.processed_data:
     images_dir = st.session_state.processed_data['images_dir']
     audio_dir = st.session_state.processed_data['audio_dir']
     
+    page_stats = st.session_state.processed_data.get('page_stats', [])
+    if page_stats:
+        method_labels = {
+            'embedded': "taken from embedded pictures",
+            'rendered': "rendered",
+            'image': "read from image files",
+            'resumed': "resumed from an earlier run",
+        }
+        method_counts = {}
+        for stat in page_stats:
+            method_counts[stat['method']] = method_counts.get(stat['method'], 0) + 1
+        with st.expander("Ingestion stats: " + ", ".join(
+            f"{count} image(s) {method_labels.get(method, method)}" for method, count in method_counts.items()
+        )):
+            st.dataframe(
+                [
+                    {'page': stat['page'], 'image': os.path.basename(stat['path']), 'method': stat['method']}
+                    for stat in page_stats
+                ],
+                hide_index=True,
+                use_container_width=True
+            )
+    
+    metrics = st.session_state.processed_data.get('metrics')
+    if metrics and metrics['stages']:
+        total_seconds = max(metrics['total_seconds'], 1e-9)
+        with st.expander(f"Stage timings: {metrics['total_seconds']:.1f} s in total, "
+                         f"most of it in {metrics['stages'][0]['stage']}"):
+            st.dataframe(
+                [
+                    {
+                        'stage': stage['stage'],
+                        'seconds': round(stage['seconds'], 3),
+                        'share': stage['seconds'] / total_seconds,
+                        'calls': stage['calls'],
+                        'MB': round(stage['bytes'] / 1024 ** 2, 2),
+                    }
+                    for stage in metrics['stages']
+                ],
+                column_config={'share': st.column_config.ProgressColumn('share', format="%.2f", min_value=0, max_value=1)},
+                hide_index=True,
+                use_container_width=True
+            )
+            
+            # The slowest pages and words, with the stage that dominated each
+            col1, col2 = st.columns([1, 1])
+            for col, key, label in ((col1, 'slowest_pages', 'page'), (col2, 'slowest_words', 'word')):
+                with col:
+                    slowest = metrics[key]
+                    if not slowest:
+                        continue
+                    worst = slowest[0]
+                    worst_stage = max(worst['stages'], key=worst['stages'].get)
+                    st.warning(f"Slowest {label}: **{worst[label]}** took {worst['seconds']:.2f} s, "
+                               f"{worst['stages'][worst_stage]:.2f} s of it in {worst_stage}")
+                    st.dataframe(
+                        [
+                            {
+                                label: item[label],
+                                'seconds': round(item['seconds'], 3),
+                                'slowest stage': max(item['stages'], key=item['stages'].get),
+                            }
+                            for item in slowest
+                        ],
+                        hide_index=True,
+                        use_container_width=True
+                    )
+    
     # Initialize accepted words in session state if not present
     if 'word_acceptance' not in st.session_state:
         st.session_state.word_acceptance = {word: False for word in words}
@@ -149,7 +518,7 @@ if st.session_state.processed_data:
                     image_filename = sanitize_filename(word) + ".jpg"
                     image_path = os.path.join(images_dir, image_filename)
                     if os.path.exists(image_path):
-                        st.image(image_path, caption=word, width=200)
+                        st.image(read_media_bytes(image_path, os.stat(image_path).st_mtime_ns), caption=word, width=200)
                     else:
                         st.warning(f"Image not found: {image_filename}")
                 
@@ -158,9 +527,7 @@ if st.session_state.processed_data:
                     audio_filename = sanitize_filename(word) + ".mp3"
                     audio_path = os.path.join(audio_dir, audio_filename)
                     if os.path.exists(audio_path):
-                        with open(audio_path, "rb") as audio_file:
-                            audio_bytes = audio_file.read()
-                        st.audio(audio_bytes, format='audio/mp3')
+                        st.audio(read_media_bytes(audio_path, os.stat(audio_path).st_mtime_ns), format='audio/mp3')
                     else:
                         st.warning(f"Audio not found: {audio_filename}")
     
@@ -182,75 +549,9 @@ if st.session_state.processed_data:
                 rel_audio_dir = get_relative_path(shared_audio_dir)
                 st.info(f"📁 **Save Paths (relative to project root):**\n- Images: `{rel_images_dir}`\n- Audio: `{rel_audio_dir}`")
                 
-                shared_images_dir.mkdir(parents=True, exist_ok=True)
-                shared_audio_dir.mkdir(parents=True, exist_ok=True)
-                
-                saved_images = 0
-                saved_audio = 0
-                log_messages = []
-                
-                for word in accepted_words:
-                    # Copy image (overwrites if exists)
-                    image_filename = sanitize_filename(word) + ".jpg"
-                    src_image = os.path.join(images_dir, image_filename)
-                    dst_image = shared_images_dir / image_filename
-                    
-                    if os.path.exists(src_image):
-                        src_size = os.path.getsize(src_image)
-                        existed_before = dst_image.exists()
-                        if existed_before:
-                            old_size = os.path.getsize(dst_image)
-                        
-                        try:
-                            shutil.copy2(src_image, dst_image)
-                            dst_size = os.path.getsize(dst_image)
-                            saved_images += 1
-                            
-                            status = "✅ OVERWRITTEN" if existed_before else "✅ CREATED"
-                            rel_dst = get_relative_path(dst_image)
-                            log_msg = f"{status} Image: `{rel_dst}`"
-                            if existed_before:
-                                log_msg += f" (old: {old_size} bytes → new: {dst_size} bytes)"
-                            else:
-                                log_msg += f" ({dst_size} bytes)"
-                            log_messages.append(log_msg)
-                        except Exception as e:
-                            rel_dst = get_relative_path(dst_image)
-                            log_messages.append(f"❌ ERROR saving image `{rel_dst}`: {e}")
-                    else:
-                        rel_src = get_relative_path(Path(src_image)) if os.path.exists(src_image) else src_image
-                        log_messages.append(f"⚠️ Source image not found: `{rel_src}`")
-                    
-                    # Copy audio (overwrites if exists)
-                    audio_filename = sanitize_filename(word) + ".mp3"
-                    src_audio = os.path.join(audio_dir, audio_filename)
-                    dst_audio = shared_audio_dir / audio_filename
-                    
-                    if os.path.exists(src_audio):
-                        src_size = os.path.getsize(src_audio)
-                        existed_before = dst_audio.exists()
-                        if existed_before:
-                            old_size = os.path.getsize(dst_audio)
-                        
-                        try:
-                            shutil.copy2(src_audio, dst_audio)
-                            dst_size = os.path.getsize(dst_audio)
-                            saved_audio += 1
-                            
-                            status = "✅ OVERWRITTEN" if existed_before else "✅ CREATED"
-                            rel_dst = get_relative_path(dst_audio)
-                            log_msg = f"{status} Audio: `{rel_dst}`"
-                            if existed_before:
-                                log_msg += f" (old: {old_size} bytes → new: {dst_size} bytes)"
-                            else:
-                                log_msg += f" ({dst_size} bytes)"
-                            log_messages.append(log_msg)
-                        except Exception as e:
-                            rel_dst = get_relative_path(dst_audio)
-                            log_messages.append(f"❌ ERROR saving audio `{rel_dst}`: {e}")
-                    else:
-                        rel_src = get_relative_path(Path(src_audio)) if os.path.exists(src_audio) else src_audio
-                        log_messages.append(f"⚠️ Source audio not found: `{rel_src}`")
+                saved_images, saved_audio, log_messages = publish_word_media(
+                    accepted_words, images_dir, audio_dir
+                )
                 
                 # Display detailed log
                 with st.expander("📋 Detailed Save Log", expanded=True):
@@ -284,118 +585,73 @@ if st.session_state.accepted_words:
     
     if "Audio Match" in target_apps:
         st.subheader("Audio Match Configuration")
+        audio_match_file = project_root / "audio_match" / "words.json"
         audio_match_group = st.selectbox(
             "Select group:",
-            ["Partani", "Gimel", "numbers", "colors", "people"],
+            load_config_groups(str(audio_match_file)),
             key="audio_match_group"
         )
         json_updates['audio_match'] = {
-            'file': project_root / "audio_match" / "words.json",
-            'group': audio_match_group
+            'file': audio_match_file,
+            'group': audio_match_group,
+            'format': WEIGHTED
         }
     
     if "Image Grid" in target_apps:
         st.subheader("Image Grid Configuration")
+        image_grid_file = project_root / "image_grid" / "images.json"
         image_grid_group = st.selectbox(
             "Select group:",
-            ["Partani", "Gimel"],
+            load_config_groups(str(image_grid_file)),
             key="image_grid_group"
         )
         json_updates['image_grid'] = {
-            'file': project_root / "image_grid" / "images.json",
-            'group': image_grid_group
+            'file': image_grid_file,
+            'group': image_grid_group,
+            'format': PLAIN
         }
     
     if "Connect4" in target_apps:
         st.subheader("Connect4 Configuration")
+        connect4_file = project_root / "connect4_words" / "images.json"
         connect4_group = st.selectbox(
             "Select group:",
-            ["Gimel"],
+            load_config_groups(str(connect4_file)),
             key="connect4_group"
         )
         json_updates['connect4'] = {
-            'file': project_root / "connect4_words" / "images.json",
-            'group': connect4_group
+            'file': connect4_file,
+            'group': connect4_group,
+            'format': PLAIN
         }
     
     if json_updates and st.button("💾 Apply Updates to JSON Files", type="primary", use_container_width=True):
         with st.spinner("Updating JSON files..."):
-            # Ensure images and audio are saved (in case user skipped the Save button)
+            # Ensure images and audio are saved (in case user skipped the Save button).
+            # Files already published by the Save step are skipped.
             if st.session_state.processed_data:
-                shared_images_dir = project_root / "shared" / "static" / "images"
-                shared_audio_dir = project_root / "shared" / "static" / "audio"
-                
-                shared_images_dir.mkdir(parents=True, exist_ok=True)
-                shared_audio_dir.mkdir(parents=True, exist_ok=True)
-                
                 images_dir = st.session_state.processed_data['images_dir']
                 audio_dir = st.session_state.processed_data['audio_dir']
+                _, _, log_messages = publish_word_media(accepted_words, images_dir, audio_dir)
                 
-                log_messages = []
-                for word in accepted_words:
-                    # Copy image (overwrites if exists)
-                    image_filename = sanitize_filename(word) + ".jpg"
-                    src_image = os.path.join(images_dir, image_filename)
-                    dst_image = shared_images_dir / image_filename
-                    if os.path.exists(src_image):
-                        existed_before = dst_image.exists()
-                        shutil.copy2(src_image, dst_image)
-                        status = "OVERWRITTEN" if existed_before else "CREATED"
-                        rel_dst = get_relative_path(dst_image)
-                        log_messages.append(f"Image `{rel_dst}`: {status}")
-                    else:
-                        rel_src = get_relative_path(Path(src_image)) if os.path.exists(src_image) else src_image
-                        log_messages.append(f"⚠️ Source image not found: `{rel_src}`")
-                    
-                    # Copy audio (overwrites if exists)
-                    audio_filename = sanitize_filename(word) + ".mp3"
-                    src_audio = os.path.join(audio_dir, audio_filename)
-                    dst_audio = shared_audio_dir / audio_filename
-                    if os.path.exists(src_audio):
-                        existed_before = dst_audio.exists()
-                        shutil.copy2(src_audio, dst_audio)
-                        status = "OVERWRITTEN" if existed_before else "CREATED"
-                        rel_dst = get_relative_path(dst_audio)
-                        log_messages.append(f"Audio `{rel_dst}`: {status}")
-                    else:
-                        rel_src = get_relative_path(Path(src_audio)) if os.path.exists(src_audio) else src_audio
-                        log_messages.append(f"⚠️ Source audio not found: `{rel_src}`")
-                
-                if log_messages:
-                    rel_images_dir = get_relative_path(shared_images_dir)
-                    rel_audio_dir = get_relative_path(shared_audio_dir)
-                    st.info(f"Files saved to:\n- Images: `{rel_images_dir}`\n- Audio: `{rel_audio_dir}`")
+                written = [msg for msg in log_messages if not msg.startswith("⏭️")]
+                if written:
+                    shared_static_dir = get_relative_path(project_root / "shared" / "static")
+                    st.info(f"Files saved to `{shared_static_dir}`:\n" + "\n".join(f"- {msg}" for msg in written))
             
-            # Update JSON files
-            for app_name, config in json_updates.items():
-                filepath = config['file']
-                group = config['group']
-                
-                if not filepath.exists():
-                    rel_path = get_relative_path(filepath)
-                    st.error(f"JSON file not found: `{rel_path}`")
+            # Update JSON files (one indexed pass per file, written atomically)
+            diff = merge_words_into_configs(json_updates, accepted_words)
+            load_config_groups.clear()
+            for app_name, result in diff.items():
+                rel_path = get_relative_path(result['file'])
+                if result['error']:
+                    st.error(f"{result['error']}: `{rel_path}`")
                     continue
                 
-                data = load_json_file(str(filepath))
-                
-                if app_name == 'audio_match':
-                    # Add as {"word": "...", "weight": 1}
-                    if group not in data:
-                        data[group] = []
-                    for word in accepted_words:
-                        # Check if word already exists
-                        if not any(item.get('word') == word for item in data[group]):
-                            data[group].append({"word": word, "weight": 1})
-                else:
-                    # Add as string to array
-                    if group not in data:
-                        data[group] = []
-                    for word in accepted_words:
-                        if word not in data[group]:
-                            data[group].append(word)
-                
-                save_json_file(str(filepath), data)
-                st.success(f"Updated {app_name} - {group}")
+                message = f"Updated {app_name} - {result['group']}: {len(result['added'])} added"
+                if result['existing']:
+                    message += f", {len(result['existing'])} already present"
+                st.success(message)
             
             st.success("All updates completed successfully!")
             
@@ -403,11 +659,16 @@ if st.session_state.accepted_words:
             st.session_state.processed_data = None
             st.session_state.accepted_words = []
             st.session_state.word_acceptance = {}
+            st.session_state.publish_record = {}
             
-            # Clean up temp directory
-            if st.session_state.temp_dir and os.path.exists(st.session_state.temp_dir):
-                shutil.rmtree(st.session_state.temp_dir)
+            # Clean up the workspace
+            if st.session_state.temp_dir:
+                # A resumed job's workspace may belong to an earlier session; leave it to expire
+                get_workspace_manager().release(st.session_state.temp_dir, owner=st.session_state.workspace_owner)
                 st.session_state.temp_dir = None
+                get_job_runner().prune()
+                list_job_records.clear()
+                get_workspace_usage.clear()
             
             st.rerun()
 
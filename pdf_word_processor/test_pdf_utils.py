@@ -0,0 +1,145 @@
+import io
+import os
+
+import fitz
+import pytest
+from PIL import Image, ImageDraw
+
+from journal_utils import IngestJournal
+from pdf_utils import detect_card_regions, extract_page_image, process_pdf_images
+
+GRIDS = [(1, 1), (1, 3), (2, 2), (2, 3), (3, 2), (3, 3), (4, 3), (6, 4)]
+
+
+def _sheet(rows: int, cols: int, fill: str, ruled: bool, gap: int = 40, margin: int = 80) -> tuple:
+    """An A4 page at 150 DPI holding a grid of cards. Returns (image, card boxes in reading order)."""
+    size = (1240, 1754)
+    img = Image.new("RGB", size, "white")
+    draw = ImageDraw.Draw(img)
+    width = (size[0] - 2 * margin - (cols - 1) * gap) / cols
+    height = (size[1] - 2 * margin - (rows - 1) * gap) / rows
+    boxes = []
+    for row in range(rows):
+        for col in range(cols):
+            x0, y0 = margin + col * (width + gap), margin + row * (height + gap)
+            box = (int(x0), int(y0), int(x0 + width), int(y0 + height))
+            boxes.append(box)
+            if fill == "solid":
+                draw.rectangle(box, fill=(40, 90, 160))
+            elif fill == "photo":
+                noise = Image.effect_noise((box[2] - box[0], box[3] - box[1]), 80).convert("RGB")
+                img.paste(noise, box[:2])
+            else:
+                draw.ellipse((x0 + width * 0.2, y0 + height * 0.2, x0 + width * 0.8, y0 + height * 0.8), fill="black")
+    if ruled:
+        # Cutting lines through the middle of every gap, plus a frame
+        for row in range(1, rows):
+            y = int(margin + row * (height + gap) - gap / 2)
+            draw.line((margin / 2, y, size[0] - margin / 2, y), fill="black", width=2)
+        for col in range(1, cols):
+            x = int(margin + col * (width + gap) - gap / 2)
+            draw.line((x, margin / 2, x, size[1] - margin / 2), fill="black", width=2)
+        draw.rectangle((margin / 2, margin / 2, size[0] - margin / 2, size[1] - margin / 2), outline="black", width=2)
+    return img, boxes
+
+
+@pytest.mark.parametrize("ruled", [False, True])
+@pytest.mark.parametrize("fill", ["solid", "photo", "drawing"])
+@pytest.mark.parametrize("rows, cols", GRIDS)
+def test_detect_card_regions_finds_every_card(rows, cols, fill, ruled):
+    img, expected = _sheet(rows, cols, fill, ruled)
+    regions = detect_card_regions(img)
+
+    assert len(regions) == rows * cols
+    # Each region holds its card, in reading order
+    for region, box in zip(regions, expected):
+        if fill != "drawing":
+            assert all(abs(a - b) <= 10 for a, b in zip(region, box))
+        else:
+            assert box[0] <= region[0] and box[1] <= region[1] and region[2] <= box[2] and region[3] <= box[3]
+
+
+def test_detect_card_regions_blank_page():
+    assert detect_card_regions(Image.new("RGB", (1240, 1754), "white")) == []
+
+
+def _sheets_pdf(grids: list[tuple]) -> bytes:
+    """A PDF with one page per (rows, cols) card sheet."""
+    doc = fitz.open()
+    for rows, cols in grids:
+        img, _ = _sheet(rows, cols, "solid", ruled=False)
+        buffer = io.BytesIO()
+        img.save(buffer, "PNG")
+        page = doc.new_page(width=595, height=842)
+        page.insert_image(page.rect, stream=buffer.getvalue())
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def test_split_cards_names_every_card(tmp_path):
+    words = [f"w{i}" for i in range(10)]
+    stats = process_pdf_images(_sheets_pdf([(2, 2), (2, 3)]), str(tmp_path), words_list=words, split_cards=True)
+
+    assert [os.path.basename(stat['path']) for stat in stats] == [f"{word}.jpg" for word in words]
+
+
+def test_split_cards_fails_when_cards_and_words_differ(tmp_path):
+    words = [f"w{i}" for i in range(9)]
+    with pytest.raises(ValueError, match="10 card\\(s\\) but 9 word\\(s\\).*page 1: 4, page 2: 6"):
+        process_pdf_images(_sheets_pdf([(2, 2), (2, 3)]), str(tmp_path), words_list=words, split_cards=True)
+
+
+def test_split_cards_resume_after_changing_the_page_selection(tmp_path):
+    pdf = _sheets_pdf([(2, 2), (2, 3), (2, 2)])
+    words = [f"w{i}" for i in range(10)]
+    journal = IngestJournal(str(tmp_path / "journal.jsonl"), {'source': 'sheets'})
+    process_pdf_images(pdf, str(tmp_path / "out"), words_list=words, split_cards=True,
+                       page_words={0: None, 1: None}, journal=journal)
+
+    # Page 2 now holds the first words, so its earlier images can't be reused
+    stats = process_pdf_images(pdf, str(tmp_path / "out"), words_list=words, split_cards=True,
+                               page_words={1: None, 2: None}, journal=journal)
+
+    assert [os.path.basename(stat['path']) for stat in stats] == [f"{word}.jpg" for word in words]
+    assert {stat['method'] for stat in stats} == {'rendered'}
+
+    # Running the same selection again resumes every page
+    stats = process_pdf_images(pdf, str(tmp_path / "out"), words_list=words, split_cards=True,
+                               page_words={1: None, 2: None}, journal=journal)
+    assert [os.path.basename(stat['path']) for stat in stats] == [f"{word}.jpg" for word in words]
+    assert {stat['method'] for stat in stats} == {'resumed'}
+
+
+def _picture_page(content: bytes = None, rotation: int = 0) -> fitz.Document:
+    """A one-page PDF with a red/blue picture at (50, 50, 250, 150), optionally with its own content stream."""
+    img = Image.new("RGB", (200, 100), "blue")
+    img.paste((255, 0, 0), (0, 0, 100, 100))
+    buffer = io.BytesIO()
+    img.save(buffer, "PNG")
+    doc = fitz.open()
+    page = doc.new_page(width=300, height=300)
+    page.insert_image(fitz.Rect(50, 50, 250, 150), stream=buffer.getvalue())
+    if content is not None:
+        doc.update_stream(page.get_contents()[0], content)
+    page.set_rotation(rotation)
+    return doc
+
+
+@pytest.mark.parametrize("content", [None, b"q\n0 0 300 300 re W n\nq\n200 0 0 100 50 150 cm\n/fzImg0 Do\nQ\nQ\n"])
+def test_extract_page_image_takes_the_embedded_picture(content):
+    doc = _picture_page(content)
+    img = extract_page_image(doc, doc[0])
+
+    assert img.size == (200, 100)
+    assert img.getpixel((150, 50)) == (0, 0, 255)
+
+
+@pytest.mark.parametrize("content, rotation", [
+    # Clipped to the red half
+    (b"q\n50 150 100 100 re W n\nq\n200 0 0 100 50 150 cm\n/fzImg0 Do\nQ\nQ\n", 0),
+    (None, 90),
+])
+def test_extract_page_image_renders_clipped_or_rotated_pages(content, rotation):
+    doc = _picture_page(content, rotation)
+    assert extract_page_image(doc, doc[0]) is None
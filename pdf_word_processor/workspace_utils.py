@@ -0,0 +1,193 @@
+import hashlib
+import os
+import shutil
+import tempfile
+import time
+
+from config_utils import load_json_file, save_json_file
+
+
+# Metadata file kept at the top of every workspace.
+META_FILENAME = ".workspace.json"
+
+
+def default_workspace_root() -> str:
+    """Directory holding all session workspaces."""
+    return os.path.join(tempfile.gettempdir(), "pdf_word_processor_workspaces")
+
+
+def directory_size(path: str) -> int:
+    """Total size in bytes of the files under a directory."""
+    total = 0
+    for root, _, files in os.walk(path):
+        for filename in files:
+            try:
+                total += os.lstat(os.path.join(root, filename)).st_size
+            except FileNotFoundError:
+                pass
+    return total
+
+
+class WorkspaceManager:
+    """
+    Owns the per-session working directories under one root.
+
+    A workspace is keyed by a digest of its input and by its owner (the
+    session), so re-uploading the same file in a session reuses the same
+    directory (and, through the ingestion journal, the work already done in
+    it), while other sessions uploading that file get their own. cleanup()
+    removes workspaces that have not been used for ttl_seconds, then evicts
+    the least recently used ones until the total size fits in quota_bytes.
+    Workspaces touched within in_use_seconds are never evicted, since a
+    session may still be reviewing them.
+    """
+
+    def __init__(self, root: str = None, quota_bytes: int = 2 * 1024 ** 3, ttl_seconds: int = 24 * 3600,
+                 cleanup_interval: int = 300, in_use_seconds: int = 3600):
+        self.root = root or default_workspace_root()
+        self.quota_bytes = quota_bytes
+        self.ttl_seconds = ttl_seconds
+        self.cleanup_interval = cleanup_interval
+        self.in_use_seconds = in_use_seconds
+        self._last_cleanup = 0.0
+        os.makedirs(self.root, exist_ok=True)
+
+    def _meta_path(self, path: str) -> str:
+        return os.path.join(path, META_FILENAME)
+
+    def acquire(self, input_data: bytes, label: str = None, owner: str = None) -> str:
+        """
+        Return the workspace for an input, creating it if needed.
+
+        Args:
+            input_data: The uploaded file's contents.
+            label: Optional human-readable name (e.g. the upload's file name).
+            owner: Optional owner id (e.g. a session id). Identical uploads
+                by the same owner share a workspace; different owners never do,
+                so concurrent jobs and releases can't interfere.
+
+        Returns:
+            str: Path of the workspace directory.
+        """
+        key = hashlib.sha256(input_data).hexdigest()[:16]
+        if owner:
+            key += f"-{owner}"
+        path = os.path.join(self.root, key)
+        os.makedirs(path, exist_ok=True)
+        meta_path = self._meta_path(path)
+        if os.path.exists(meta_path):
+            meta = load_json_file(meta_path)
+        else:
+            meta = {'key': key, 'owner': owner, 'created_at': time.time(), 'input_size': len(input_data)}
+        if label:
+            meta['label'] = label
+        meta['last_used'] = time.time()
+        save_json_file(meta_path, meta)
+        return path
+
+    def touch(self, path: str):
+        """Mark a workspace as in use, postponing its TTL expiry."""
+        meta_path = self._meta_path(path)
+        if os.path.exists(meta_path):
+            meta = load_json_file(meta_path)
+            meta['last_used'] = time.time()
+            save_json_file(meta_path, meta)
+
+    def release(self, path: str, owner: str = None):
+        """
+        Delete a workspace that is no longer needed.
+
+        If owner is given, the workspace is only deleted when it belongs to
+        that owner; anyone else's is left for cleanup() to expire.
+        """
+        if not (path and os.path.dirname(os.path.abspath(path)) == os.path.abspath(self.root)
+                and os.path.isdir(path)):
+            return
+        if owner is not None:
+            meta_path = self._meta_path(path)
+            if not os.path.exists(meta_path) or load_json_file(meta_path).get('owner') != owner:
+                return
+        shutil.rmtree(path, ignore_errors=True)
+
+    def list_workspaces(self) -> list[dict]:
+        """All workspaces with their metadata, path and size, least recently used first."""
+        workspaces = []
+        for name in os.listdir(self.root):
+            path = os.path.join(self.root, name)
+            if not os.path.isdir(path):
+                continue
+            meta_path = self._meta_path(path)
+            meta = load_json_file(meta_path) if os.path.exists(meta_path) else {}
+            # Directories without metadata are leftovers; date them by mtime.
+            meta.setdefault('key', name)
+            meta.setdefault('last_used', os.path.getmtime(path))
+            meta['path'] = path
+            meta['size'] = directory_size(path)
+            workspaces.append(meta)
+        workspaces.sort(key=lambda workspace: workspace['last_used'])
+        return workspaces
+
+    def cleanup(self, protected: set = frozenset(), force: bool = False) -> list[str]:
+        """
+        Remove expired workspaces, then evict LRU ones while over quota.
+
+        Runs at most once per cleanup_interval unless force is set. Workspaces
+        used within in_use_seconds are kept as well as the protected ones.
+
+        Args:
+            protected: Workspace paths that must not be removed (e.g. in use by a job).
+            force: Run even if the last cleanup was recent.
+
+        Returns:
+            list: Paths of the removed workspaces.
+        """
+        now = time.time()
+        if not force and now - self._last_cleanup < self.cleanup_interval:
+            return []
+        self._last_cleanup = now
+
+        workspaces = self.list_workspaces()
+        protected = {os.path.abspath(path) for path in protected if path} | {
+            os.path.abspath(workspace['path']) for workspace in workspaces
+            if now - workspace['last_used'] < self.in_use_seconds
+        }
+        removed = []
+        remaining = []
+        for workspace in workspaces:
+            if os.path.abspath(workspace['path']) in protected:
+                remaining.append(workspace)
+            elif now - workspace['last_used'] > self.ttl_seconds:
+                self.release(workspace['path'])
+                removed.append(workspace['path'])
+            else:
+                remaining.append(workspace)
+
+        total = sum(workspace['size'] for workspace in remaining)
+        for workspace in remaining:
+            if total <= self.quota_bytes:
+                break
+            if os.path.abspath(workspace['path']) in protected:
+                continue
+            self.release(workspace['path'])
+            removed.append(workspace['path'])
+            total -= workspace['size']
+
+        if removed:
+            print(f"Workspace cleanup removed {len(removed)} workspace(s)")
+        return removed
+
+    def usage(self) -> dict:
+        """
+        Summarize disk usage.
+
+        Returns:
+            dict: 'total_bytes', 'quota_bytes', 'ttl_seconds' and 'workspaces'
+                (see list_workspaces).
+        """
+        workspaces = self.list_workspaces()
+        return {
+            'total_bytes': sum(workspace['size'] for workspace in workspaces),
+            'quota_bytes': self.quota_bytes,
+            'ttl_seconds': self.ttl_seconds,
+            'workspaces': workspaces,
+        }
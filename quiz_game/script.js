@@ -18,17 +18,27 @@ class QuizGame {
     }
 
     async loadQuizzes() {
+        // compiled/ is built from quizzes.yaml by scripts/compile_configs.py:
+        // the index lists the quizzes, each quiz is loaded on demand
         try {
-            const response = await fetch('quizzes.yaml');
-            const yamlText = await response.text();
-            const data = jsyaml.load(yamlText);
+            const response = await fetch('compiled/index.json');
+            const data = await response.json();
             this.quizzes = data.quizzes || [];
         } catch (error) {
             console.error('Error loading quizzes:', error);
-            alert('Error loading quizzes. Please check the quizzes.yaml file.');
+            alert('Error loading quizzes. Please check the quizzes.yaml file and run npm run build.');
         }
     }
 
+    async loadQuiz(quizIndex) {
+        const entry = this.quizzes[quizIndex];
+        if (!entry.data) {
+            const response = await fetch(`compiled/${entry.file}`);
+            entry.data = await response.json();
+        }
+        return entry.data;
+    }
+
     setupEventListeners() {
         document.getElementById('next-button').addEventListener('click', () => {
             this.handleNextQuestion();
@@ -62,7 +72,7 @@ class QuizGame {
                 <h3>${quiz.title}</h3>
                 ${quiz.description ? `<p>${quiz.description}</p>` : ''}
                 <div class="quiz-meta">
-                    <span>📝 ${quiz.questions.length} Questions</span>
+                    <span>📝 ${quiz.questions} Questions</span>
                     ${quiz.language ? `<span>🌐 ${quiz.language.toUpperCase()}</span>` : ''}
                 </div>
             `;
@@ -75,8 +85,14 @@ class QuizGame {
         });
     }
 
-    startQuiz(quizIndex) {
-        this.currentQuiz = this.quizzes[quizIndex];
+    async startQuiz(quizIndex) {
+        try {
+            this.currentQuiz = await this.loadQuiz(quizIndex);
+        } catch (error) {
+            console.error('Error loading quiz:', error);
+            alert('Error loading quiz. Please try again.');
+            return;
+        }
         this.currentQuestionIndex = 0;
         this.score = 0;
         this.userAnswers = [];
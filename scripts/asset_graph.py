@@ -0,0 +1,432 @@
+"""Asset dependency graph for the games, with a validator and an orphan pruner.
+
+Every game's configs (words.json, images.json, quizzes.yaml, ...) and code
+(index.html, script.js) are resolved to the files they make the browser
+request. The graph reports references to files that do not exist (broken
+images / silent audio at runtime) and files in the asset folders that nothing
+references (deploy bloat).
+
+Run from the repo root:
+  python3 scripts/asset_graph.py check           # exit 1 on missing files
+  python3 scripts/asset_graph.py orphans
+  python3 scripts/asset_graph.py prune --quarantine   # or --delete
+
+`check` caches its result keyed by the size and mtime of every input, so an
+unchanged tree is validated without re-reading the configs.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import sys
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Folders whose files are only reachable through the graph.
+SHARED_STATIC = "shared/static"
+# Not games: tools, the shared assets themselves, and the Vite-built escape room
+# (whose fingerprinted assets Vite tracks itself).
+SKIPPED_DIRS = {"escape_room", "pdf_word_processor", "pdf_generator", "scripts", "shared", "node_modules"}
+
+CACHE_FILE = ".asset-graph-cache.json"
+QUARANTINE_DIR = ".asset-quarantine"
+
+ASSET_EXTENSIONS = ("jpg", "jpeg", "png", "gif", "webp", "svg", "mp3", "wav", "ogg")
+# Asset paths written out literally in game code, e.g. new Audio('static/audio/x.mp3').
+LITERAL_ASSET_RE = re.compile(
+    r"""['"]((?:\.\./shared/)?static/[^'"$`]+?\.(?:%s))['"]""" % "|".join(ASSET_EXTENSIONS)
+)
+FETCH_RE = re.compile(r"""fetch\(\s*['"]([^'"]+)['"]\s*\)""")
+SCRIPT_RE = re.compile(r"""<script\b[^>]*\bsrc=["']([^"']+)["']""", re.IGNORECASE)
+LINK_RE = re.compile(r"""<link\b[^>]*>""", re.IGNORECASE)
+HREF_RE = re.compile(r"""\bhref=["']([^"']+)["']""", re.IGNORECASE)
+IMG_RE = re.compile(r"""<img\b[^>]*\bsrc=["']([^"'$]+)["']""", re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class Reference:
+    """One file (or external URL) a game can request."""
+    game: str
+    group: str      # config group (category, word list, quiz), or None for every group
+    path: str       # repo-relative POSIX path, or the URL for kind 'external'
+    source: str     # repo-relative file that holds the reference
+    kind: str       # 'code', 'config', 'image', 'audio', 'static' or 'external'
+    optional: bool = False  # the game copes with it missing (e.g. a bonus sound)
+
+
+def word_image(word: str) -> str:
+    """Image path the games build for a word: spaces become underscores."""
+    return f"{SHARED_STATIC}/images/{word.replace(' ', '_')}.jpg"
+
+
+def word_audio(word: str) -> str:
+    """Audio path the games build for a word: spaces become underscores."""
+    return f"{SHARED_STATIC}/audio/{word.replace(' ', '_')}.mp3"
+
+
+def _resolve(game: str, url: str) -> str:
+    """Repo-relative path of a URL used inside a game's page."""
+    url = url.split("?", 1)[0].split("#", 1)[0]
+    return os.path.normpath(os.path.join(game, url)).replace(os.sep, "/")
+
+
+def _is_local(url: str) -> bool:
+    return bool(url) and not url.startswith(("http:", "https:", "//", "data:", "#", "mailto:")) \
+        and "${" not in url
+
+
+def _asset_kind(path: str) -> str:
+    if path.startswith(f"{SHARED_STATIC}/images/"):
+        return "image"
+    if path.startswith(f"{SHARED_STATIC}/audio/"):
+        return "audio"
+    return "static"
+
+
+def _load_json(root: Path, path: str):
+    with (root / path).open(encoding="utf-8") as f:
+        return json.load(f)
+
+
+def list_games(root: Path = ROOT) -> list[str]:
+    """Game folders: top-level directories with an index.html."""
+    return sorted(
+        entry.name for entry in root.iterdir()
+        if entry.is_dir() and entry.name not in SKIPPED_DIRS and not entry.name.startswith(".")
+        and (entry / "index.html").is_file()
+    )
+
+
+def _code_references(root: Path, game: str) -> list[Reference]:
+    """The page itself, its scripts and stylesheets, fetched configs and literal asset paths."""
+    page = f"{game}/index.html"
+    refs = [Reference(game, None, page, page, "code")]
+    html = (root / page).read_text(encoding="utf-8")
+
+    urls = SCRIPT_RE.findall(html)
+    for tag in LINK_RE.findall(html):
+        if re.search(r"""rel=["']?(stylesheet|icon|manifest)""", tag, re.IGNORECASE):
+            urls += HREF_RE.findall(tag)
+    scripts = []
+    for url in urls:
+        if url.startswith(("http:", "https:", "//")):
+            refs.append(Reference(game, None, url, page, "external"))
+        elif _is_local(url):
+            path = _resolve(game, url)
+            refs.append(Reference(game, None, path, page, "code"))
+            if path.endswith(".js"):
+                scripts.append(path)
+    for url in IMG_RE.findall(html):
+        if _is_local(url):
+            path = _resolve(game, url)
+            refs.append(Reference(game, None, path, page, _asset_kind(path)))
+
+    for script in scripts:
+        if not (root / script).is_file():
+            continue
+        code = (root / script).read_text(encoding="utf-8")
+        for url in FETCH_RE.findall(code):
+            refs.append(Reference(game, None, _resolve(game, url), script, "config"))
+        for url in LITERAL_ASSET_RE.findall(code):
+            path = _resolve(game, url)
+            # Sounds are played with .catch(() => {}), so a missing one is not fatal.
+            refs.append(Reference(game, None, path, script, _asset_kind(path),
+                                  optional=path.endswith(".mp3") and not path.startswith(SHARED_STATIC)))
+    return refs
+
+
+def _image_group_references(root: Path, game: str) -> list[Reference]:
+    """Games that show the images of an image_grid/images.json category."""
+    source = "image_grid/images.json"
+    refs = []
+    for group, words in _load_json(root, source).items():
+        refs += [Reference(game, group, word_image(word), source, "image") for word in words]
+    return refs
+
+
+def _compiled_shard_references(root: Path, game: str) -> list[Reference]:
+    """
+    Per-group config shards built by scripts/compile_configs.py.
+
+    The game fetches <game>/compiled/index.json, then the shard of the group
+    being played. Nothing is returned until the configs have been compiled.
+    """
+    index_path = f"{game}/compiled/index.json"
+    if not (root / index_path).is_file():
+        return []
+    index = _load_json(root, index_path)
+    if "groups" in index:
+        entries = index["groups"].items()
+    else:
+        entries = [(quiz["title"], quiz) for quiz in index["quizzes"]]
+    return [
+        Reference(game, group, f"{game}/compiled/{entry['file']}", index_path, "config")
+        for group, entry in entries
+    ]
+
+
+def _audio_match_references(root: Path, game: str) -> list[Reference]:
+    source = "audio_match/words.json"
+    refs = _compiled_shard_references(root, game)
+    for group, entries in _load_json(root, source).items():
+        for entry in entries:
+            refs.append(Reference(game, group, word_image(entry["word"]), source, "image"))
+            refs.append(Reference(game, group, word_audio(entry["word"]), source, "audio"))
+    return refs
+
+
+def _connect4_references(root: Path, game: str) -> list[Reference]:
+    source = "connect4_words/words.json"
+    categories = _load_json(root, "connect4_words/images.json")
+    refs = []
+    for group, word_list in _load_json(root, source)["wordLists"].items():
+        if word_list.get("isImageMode") and word_list.get("category"):
+            for word in categories.get(word_list["category"], []):
+                refs.append(Reference(game, group, word_image(word), "connect4_words/images.json", "image"))
+    return refs
+
+
+def _snakes_ladders_references(root: Path, game: str) -> list[Reference]:
+    source = "snakes_ladders/images.json"
+    return [
+        Reference(game, None, _resolve(game, image["url"]), source, "image")
+        for image in _load_json(root, source).get("images", [])
+    ]
+
+
+def _quiz_references(root: Path, game: str) -> list[Reference]:
+    """Question images in quizzes.yaml, grouped by quiz title (read line by line; no YAML parser needed)."""
+    source = "quiz_game/quizzes.yaml"
+    refs = _compiled_shard_references(root, game)
+    group = None
+    for line in (root / source).read_text(encoding="utf-8").splitlines():
+        title = re.match(r"""\s*-\s*title:\s*["']?(.*?)["']?\s*$""", line)
+        if title:
+            group = title.group(1)
+            continue
+        image = re.match(r"""\s*image:\s*["']?([^"'\s]+)""", line)
+        if image and _is_local(image.group(1)):
+            path = _resolve(game, image.group(1))
+            refs.append(Reference(game, group, path, source, _asset_kind(path)))
+    return refs
+
+
+# Config-driven references per game, on top of what the game's code references.
+CONFIG_COLLECTORS = {
+    "audio_match": _audio_match_references,
+    "image_grid": _image_group_references,
+    "memory_game": _image_group_references,
+    "picture_reveal": _image_group_references,
+    "connect4_words": _connect4_references,
+    "snakes_ladders": _snakes_ladders_references,
+    "quiz_game": _quiz_references,
+}
+
+
+def asset_roots(root: Path = ROOT) -> list[str]:
+    """Folders that hold only assets: shared/static and each game's static/."""
+    roots = [SHARED_STATIC]
+    roots += [f"{game}/static" for game in list_games(root) if (root / game / "static").is_dir()]
+    return roots
+
+
+class AssetGraph:
+    """All references of all games, with the queries the build tools need."""
+
+    def __init__(self, references: list[Reference], root: Path = ROOT):
+        self.root = root
+        self.references = references
+
+    @classmethod
+    def build(cls, root: Path = ROOT) -> "AssetGraph":
+        references = []
+        for game in list_games(root):
+            references += _code_references(root, game)
+            collector = CONFIG_COLLECTORS.get(game)
+            if collector:
+                references += collector(root, game)
+        return cls(references, root)
+
+    def games(self) -> list[str]:
+        return sorted({ref.game for ref in self.references})
+
+    def groups(self, game: str) -> list[str]:
+        """Config groups of a game; empty if the game has no groups."""
+        return sorted({ref.group for ref in self.references if ref.game == game and ref.group is not None})
+
+    def for_game(self, game: str, group: str = None) -> list[Reference]:
+        """
+        References a game makes, de-duplicated by path.
+
+        With a group, only that group's assets plus the group-independent
+        ones; without, every group's.
+        """
+        seen = {}
+        for ref in self.references:
+            if ref.game != game or (group is not None and ref.group not in (None, group)):
+                continue
+            seen.setdefault(ref.path, ref)
+        return list(seen.values())
+
+    def exists(self, ref: Reference) -> bool:
+        return ref.kind == "external" or (self.root / ref.path).is_file()
+
+    def missing(self) -> list[Reference]:
+        """References to files that do not exist, one per (path, source)."""
+        seen = {}
+        for ref in self.references:
+            if not self.exists(ref):
+                seen.setdefault((ref.path, ref.source), ref)
+        return sorted(seen.values(), key=lambda ref: (ref.path, ref.source))
+
+    def near_miss(self, path: str) -> str:
+        """An existing file a missing path was probably meant to be (case / space vs underscore)."""
+        directory, name = os.path.split(path)
+        if not (self.root / directory).is_dir():
+            return None
+        wanted = name.lower().replace(" ", "_")
+        for candidate in os.listdir(self.root / directory):
+            if candidate.lower().replace(" ", "_") == wanted and candidate != name:
+                return f"{directory}/{candidate}"
+        return None
+
+    def asset_files(self) -> list[str]:
+        """Every file under the asset folders, repo-relative."""
+        files = []
+        for asset_root in asset_roots(self.root):
+            for dirpath, _, filenames in os.walk(self.root / asset_root):
+                for filename in filenames:
+                    if filename.startswith("."):
+                        continue
+                    path = Path(dirpath, filename).relative_to(self.root)
+                    files.append(path.as_posix())
+        return sorted(files)
+
+    def orphans(self) -> list[str]:
+        """
+        Asset files nothing references.
+
+        Files that a missing reference was probably meant to hit (see
+        near_miss) are kept out, so pruning never removes the file a typo'd
+        config should be fixed to point at.
+        """
+        referenced = {ref.path for ref in self.references}
+        referenced |= {self.near_miss(ref.path) for ref in self.missing()}
+        return [path for path in self.asset_files() if path not in referenced]
+
+
+def input_signature(root: Path = ROOT) -> str:
+    """Digest of the size and mtime of everything the graph is built from."""
+    digest = hashlib.sha256()
+    games = list_games(root)
+    paths = []
+    for game in games:
+        paths += [p for p in (root / game).iterdir() if p.is_file()]
+    for asset_root in asset_roots(root):
+        paths += [Path(dirpath, f) for dirpath, _, files in os.walk(root / asset_root) for f in files]
+    for path in sorted(paths):
+        st = path.stat()
+        digest.update(f"{path.relative_to(root).as_posix()}\0{st.st_size}\0{st.st_mtime_ns}\n".encode())
+    return digest.hexdigest()
+
+
+def check_report(root: Path = ROOT, use_cache: bool = True) -> dict:
+    """
+    Missing references and orphans, reusing the cached report when no input changed.
+
+    Returns:
+        dict: 'missing' (list of reference dicts with a 'hint'), 'orphans'
+            (paths), 'cached' (bool).
+    """
+    signature = input_signature(root)
+    cache_path = root / CACHE_FILE
+    if use_cache and cache_path.is_file():
+        with cache_path.open(encoding="utf-8") as f:
+            cached = json.load(f)
+        if cached.get("signature") == signature:
+            cached["report"]["cached"] = True
+            return cached["report"]
+
+    graph = AssetGraph.build(root)
+    report = {
+        "missing": [dict(asdict(ref), hint=graph.near_miss(ref.path)) for ref in graph.missing()],
+        "orphans": graph.orphans(),
+        "cached": False,
+    }
+    with cache_path.open("w", encoding="utf-8") as f:
+        json.dump({"signature": signature, "report": report}, f, ensure_ascii=False, indent=2)
+    return report
+
+
+def prune(root: Path, orphans: list[str], delete: bool = False) -> str:
+    """
+    Remove orphaned assets.
+
+    By default they are moved to .asset-quarantine/<timestamp>/ with their
+    relative paths kept, so they can be moved back; with delete they are
+    removed. Returns the quarantine folder (None when deleting).
+    """
+    target = None if delete else root / QUARANTINE_DIR / time.strftime("%Y%m%d-%H%M%S")
+    for path in orphans:
+        if delete:
+            (root / path).unlink()
+        else:
+            destination = target / path
+            destination.parent.mkdir(parents=True, exist_ok=True)
+            shutil.move(str(root / path), str(destination))
+    return str(target) if target else None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    check_parser = subparsers.add_parser("check", help="Report missing files; exit 1 if any")
+    check_parser.add_argument("--no-cache", action="store_true", help="Rebuild the graph even if nothing changed")
+    check_parser.add_argument("--fail-on-orphans", action="store_true", help="Also exit 1 if there are orphans")
+    check_parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    subparsers.add_parser("orphans", help="List unreferenced asset files")
+    prune_parser = subparsers.add_parser("prune", help="Quarantine or delete unreferenced asset files")
+    mode = prune_parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument("--quarantine", action="store_true", help=f"Move them to {QUARANTINE_DIR}/")
+    mode.add_argument("--delete", action="store_true", help="Delete them")
+    args = parser.parse_args()
+
+    if args.command == "check":
+        report = check_report(ROOT, use_cache=not args.no_cache)
+        required = [ref for ref in report["missing"] if not ref["optional"]]
+        if args.json:
+            print(json.dumps(report, ensure_ascii=False, indent=2))
+        else:
+            for ref in report["missing"]:
+                note = " (optional)" if ref["optional"] else ""
+                hint = f" -- did you mean {ref['hint']}?" if ref["hint"] else ""
+                print(f"MISSING{note} {ref['path']}  <- {ref['source']} [{ref['game']}]{hint}")
+            print(f"{len(required)} missing, {len(report['missing']) - len(required)} optional missing, "
+                  f"{len(report['orphans'])} orphaned" + (" (cached)" if report["cached"] else ""))
+        if required or (args.fail_on_orphans and report["orphans"]):
+            sys.exit(1)
+        return
+
+    graph = AssetGraph.build(ROOT)
+    orphans = graph.orphans()
+    if args.command == "orphans":
+        total = sum((ROOT / path).stat().st_size for path in orphans)
+        for path in orphans:
+            print(path)
+        print(f"{len(orphans)} orphaned files, {total / 1024:.1f} KB")
+    elif not orphans:
+        print("No orphaned files.")
+    else:
+        target = prune(ROOT, orphans, delete=args.delete)
+        print(f"{'Deleted' if args.delete else 'Quarantined'} {len(orphans)} files" +
+              (f" into {target}" if target else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+"""Compile game configs into validated, minified, sharded JSON.
+
+  quiz_game/quizzes.yaml   -> quiz_game/compiled/index.json + one shard per quiz
+  audio_match/words.json   -> audio_match/compiled/index.json + one shard per group
+
+The index is small (titles, counts and shard file names) so a game can list
+its quizzes / groups without downloading them; the chosen one is fetched as
+its own shard. Shards are named by a hash of their content, so they can be
+cached forever, and a rebuild only writes shards whose content changed. A
+source whose hash matches the one recorded in its index is skipped entirely.
+
+Sources are validated first; any error stops the build.
+
+Run from the repo root (part of `npm run build`):
+  python3 scripts/compile_configs.py            # compile
+  python3 scripts/compile_configs.py --check    # validate only
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+from pathlib import Path
+
+import yaml
+
+ROOT = Path(__file__).resolve().parent.parent
+
+INDEX_NAME = "index.json"
+QUESTION_TYPES = ("multiple-choice", "matching")
+DIRECTIONS = ("ltr", "rtl")
+
+
+def minified(data) -> str:
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+def _is_text(value) -> bool:
+    return isinstance(value, str) and value.strip() != ""
+
+
+def _text_list(value) -> bool:
+    return isinstance(value, list) and len(value) > 0 and all(_is_text(item) or isinstance(item, (int, float))
+                                                              for item in value)
+
+
+def validate_quizzes(data) -> list[str]:
+    """Check quizzes.yaml against the schema quiz_game/script.js relies on. Returns error messages."""
+    if not isinstance(data, dict) or not isinstance(data.get("quizzes"), list) or not data["quizzes"]:
+        return ["top level must be a mapping with a non-empty 'quizzes' list"]
+    errors = []
+    for i, quiz in enumerate(data["quizzes"]):
+        where = f"quizzes[{i}]"
+        if not isinstance(quiz, dict):
+            errors.append(f"{where}: must be a mapping")
+            continue
+        if not _is_text(quiz.get("title")):
+            errors.append(f"{where}.title: required")
+        if "direction" in quiz and quiz["direction"] not in DIRECTIONS:
+            errors.append(f"{where}.direction: must be one of {', '.join(DIRECTIONS)}")
+        questions = quiz.get("questions")
+        if not isinstance(questions, list) or not questions:
+            errors.append(f"{where}.questions: must be a non-empty list")
+            continue
+        for j, question in enumerate(questions):
+            errors += _validate_question(question, f"{where}.questions[{j}]")
+    return errors
+
+
+def _validate_question(question, where: str) -> list[str]:
+    if not isinstance(question, dict):
+        return [f"{where}: must be a mapping"]
+    errors = []
+    question_type = question.get("type", "multiple-choice")
+    if question_type not in QUESTION_TYPES:
+        return [f"{where}.type: must be one of {', '.join(QUESTION_TYPES)}"]
+    if not _is_text(question.get("question")):
+        errors.append(f"{where}.question: required")
+    if "image" in question and not _is_text(question["image"]):
+        errors.append(f"{where}.image: must be a path")
+
+    if question_type == "multiple-choice":
+        answers = question.get("answers")
+        if not _text_list(answers):
+            errors.append(f"{where}.answers: must be a non-empty list")
+        correct = question.get("correct")
+        if not isinstance(correct, int) or isinstance(correct, bool) \
+                or not (_text_list(answers) and 0 <= correct < len(answers)):
+            errors.append(f"{where}.correct: must be the 0-based index of one of the answers")
+    else:
+        left, right = question.get("left_items"), question.get("right_items")
+        if not _text_list(left):
+            errors.append(f"{where}.left_items: must be a non-empty list")
+        if not _text_list(right):
+            errors.append(f"{where}.right_items: must be a non-empty list")
+        matches = question.get("correct_matches")
+        if not isinstance(matches, dict):
+            errors.append(f"{where}.correct_matches: must map left indexes to right indexes")
+        elif _text_list(left) and _text_list(right):
+            if sorted(matches) != list(range(len(left))):
+                errors.append(f"{where}.correct_matches: needs exactly one entry per left item")
+            if any(not isinstance(value, int) or not 0 <= value < len(right) for value in matches.values()):
+                errors.append(f"{where}.correct_matches: values must be indexes into right_items")
+    return errors
+
+
+def validate_word_groups(data) -> list[str]:
+    """Check audio_match/words.json: group -> list of {word, weight}. Returns error messages."""
+    if not isinstance(data, dict) or not data:
+        return ["top level must be a non-empty object of groups"]
+    errors = []
+    for group, entries in data.items():
+        if not isinstance(entries, list) or not entries:
+            errors.append(f"{group}: must be a non-empty list")
+            continue
+        seen = set()
+        for i, entry in enumerate(entries):
+            where = f"{group}[{i}]"
+            if not isinstance(entry, dict) or not _is_text(entry.get("word")):
+                errors.append(f"{where}.word: required")
+                continue
+            if entry["word"] in seen:
+                errors.append(f"{where}.word: duplicate '{entry['word']}'")
+            seen.add(entry["word"])
+            weight = entry.get("weight", 1)
+            if not isinstance(weight, (int, float)) or isinstance(weight, bool) or weight <= 0:
+                errors.append(f"{where}.weight: must be a positive number")
+    return errors
+
+
+def shard_quizzes(data) -> tuple:
+    """Returns (index, shards): quiz metadata in order, and one shard per quiz."""
+    entries, shards = [], []
+    for quiz in data["quizzes"]:
+        shards.append(quiz)
+        entries.append({
+            "title": quiz["title"],
+            "description": quiz.get("description"),
+            "language": quiz.get("language"),
+            "direction": quiz.get("direction"),
+            "questions": len(quiz["questions"]),
+        })
+    return {"quizzes": entries}, shards
+
+
+def shard_word_groups(data) -> tuple:
+    """Returns (index, shards): group name -> word count, and one shard per group."""
+    groups, shards = {}, []
+    for group, entries in data.items():
+        shards.append(entries)
+        groups[group] = {"words": len(entries)}
+    return {"groups": groups}, shards
+
+
+# (source, output directory, parser, validator, sharder, index key holding the shard entries)
+CONFIGS = [
+    ("quiz_game/quizzes.yaml", "quiz_game/compiled", yaml.safe_load, validate_quizzes, shard_quizzes, "quizzes"),
+    ("audio_match/words.json", "audio_match/compiled", json.loads, validate_word_groups, shard_word_groups, "groups"),
+]
+
+
+def compile_config(root: Path, source: str, output: str, parse, validate, shard, key: str,
+                   force: bool = False, check_only: bool = False) -> dict:
+    """
+    Validate one source and (re)write its index and changed shards.
+
+    Returns:
+        dict: 'source', 'errors', 'status' ('invalid', 'valid', 'up to date'
+            or 'compiled'), 'written' and 'removed' (shard file names).
+    """
+    result = {"source": source, "errors": [], "status": None, "written": [], "removed": []}
+    raw = (root / source).read_bytes()
+    source_hash = hashlib.sha256(raw).hexdigest()
+    out_dir = root / output
+    index_path = out_dir / INDEX_NAME
+
+    if not force and not check_only and index_path.is_file():
+        with index_path.open(encoding="utf-8") as f:
+            index = json.load(f)
+        entries = index[key].values() if isinstance(index[key], dict) else index[key]
+        if index.get("source") == source_hash and all((out_dir / entry["file"]).is_file() for entry in entries):
+            result["status"] = "up to date"
+            return result
+
+    try:
+        data = parse(raw.decode("utf-8"))
+    except (ValueError, yaml.YAMLError) as e:
+        result["errors"] = [f"could not parse: {e}"]
+    else:
+        result["errors"] = validate(data)
+    if result["errors"]:
+        result["status"] = "invalid"
+        return result
+    if check_only:
+        result["status"] = "valid"
+        return result
+
+    index, shards = shard(data)
+    entries = list(index[key].values()) if isinstance(index[key], dict) else index[key]
+    out_dir.mkdir(parents=True, exist_ok=True)
+    for entry, shard_data in zip(entries, shards):
+        text = minified(shard_data)
+        entry["file"] = hashlib.sha256(text.encode("utf-8")).hexdigest()[:12] + ".json"
+        if not (out_dir / entry["file"]).is_file():
+            (out_dir / entry["file"]).write_text(text, encoding="utf-8")
+            result["written"].append(entry["file"])
+
+    wanted = {entry["file"] for entry in entries} | {INDEX_NAME}
+    for stale in out_dir.glob("*.json"):
+        if stale.name not in wanted:
+            stale.unlink()
+            result["removed"].append(stale.name)
+
+    index["source"] = source_hash
+    index_path.write_text(minified(index), encoding="utf-8")
+    result["status"] = "compiled"
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--check", action="store_true", help="Only validate the sources")
+    parser.add_argument("--force", action="store_true", help="Recompile even if sources are unchanged")
+    args = parser.parse_args()
+
+    failed = False
+    for source, output, parse, validate, shard, key in CONFIGS:
+        result = compile_config(ROOT, source, output, parse, validate, shard, key,
+                                force=args.force, check_only=args.check)
+        detail = ""
+        if result["written"] or result["removed"]:
+            detail = f" ({len(result['written'])} shards written, {len(result['removed'])} removed)"
+        print(f"{source}: {result['status']}{detail}")
+        for error in result["errors"]:
+            print(f"  {error}")
+        failed = failed or bool(result["errors"])
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
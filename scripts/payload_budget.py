@@ -0,0 +1,142 @@
+"""Per-game payload budgets: how many bytes a tablet downloads to play a game.
+
+Each game, and each of its config groups (e.g. audio_match "Partani",
+memory_game "Gimel"), is resolved through the asset graph to everything it
+can request. Reported per game/group:
+  - total bytes (page, code, configs and every asset the group can show)
+  - critical-path bytes (page, scripts, stylesheets and configs: what must
+    arrive before the game can start)
+  - estimated request count (external CDN files count as requests; their
+    size is unknown)
+
+Budgets live in scripts/payload_budgets.json; the exit code is 1 if any game
+exceeds its budget.
+
+Run from the repo root:
+  python3 scripts/payload_budget.py
+  python3 scripts/payload_budget.py --game audio_match --group Partani --top 15
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from asset_graph import ROOT, AssetGraph
+
+BUDGETS_FILE = Path(__file__).resolve().parent / "payload_budgets.json"
+CRITICAL_KINDS = ("code", "config", "external")
+
+
+def load_budgets(path: Path = BUDGETS_FILE) -> dict:
+    with path.open(encoding="utf-8") as f:
+        return json.load(f)
+
+
+def budget_for(budgets: dict, game: str) -> dict:
+    """The default budget with the game's overrides applied."""
+    return {**budgets.get("default", {}), **budgets.get("games", {}).get(game, {})}
+
+
+def analyze(graph: AssetGraph, game: str, group: str = None) -> dict:
+    """
+    Resolve a game (and optionally one group) to its payload.
+
+    Returns:
+        dict: 'game', 'group', 'total_bytes', 'critical_bytes', 'requests',
+            'external' (count), 'missing' (paths) and 'assets' (one dict
+            per file with 'path', 'kind', 'size', 'critical'), largest first.
+    """
+    assets = []
+    missing = []
+    for ref in graph.for_game(game, group):
+        if ref.kind == "external":
+            size = None
+        elif graph.exists(ref):
+            size = (graph.root / ref.path).stat().st_size
+        else:
+            missing.append(ref.path)
+            continue
+        assets.append({'path': ref.path, 'kind': ref.kind, 'size': size,
+                       'critical': ref.kind in CRITICAL_KINDS})
+    assets.sort(key=lambda asset: asset['size'] or 0, reverse=True)
+    return {
+        'game': game,
+        'group': group,
+        'total_bytes': sum(asset['size'] or 0 for asset in assets),
+        'critical_bytes': sum(asset['size'] or 0 for asset in assets if asset['critical']),
+        'requests': len(assets),
+        'external': sum(1 for asset in assets if asset['size'] is None),
+        'missing': missing,
+        'assets': assets,
+    }
+
+
+def budget_violations(result: dict, budget: dict) -> list[str]:
+    """Human-readable descriptions of every budget the result exceeds."""
+    violations = []
+    if 'total_kb' in budget and result['total_bytes'] > budget['total_kb'] * 1024:
+        violations.append(f"total {result['total_bytes'] / 1024:.0f} KB > {budget['total_kb']} KB")
+    if 'critical_kb' in budget and result['critical_bytes'] > budget['critical_kb'] * 1024:
+        violations.append(f"critical {result['critical_bytes'] / 1024:.0f} KB > {budget['critical_kb']} KB")
+    if 'requests' in budget and result['requests'] > budget['requests']:
+        violations.append(f"requests {result['requests']} > {budget['requests']}")
+    return violations
+
+
+def analyze_all(graph: AssetGraph, budgets: dict, games: list[str] = None, group: str = None) -> list[dict]:
+    """Analyze every group of the given games (all games by default) against their budgets."""
+    results = []
+    for game in games or graph.games():
+        groups = [group] if group else (graph.groups(game) or [None])
+        for game_group in groups:
+            result = analyze(graph, game, game_group)
+            result['budget'] = budget_for(budgets, game)
+            result['violations'] = budget_violations(result, result['budget'])
+            results.append(result)
+    return results
+
+
+def format_size(size: int) -> str:
+    if size is None:
+        return "?"
+    return f"{size / 1024:.1f} KB" if size < 1024 * 1024 else f"{size / 1024 / 1024:.2f} MB"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--game", action="append", help="Only this game (repeatable)")
+    parser.add_argument("--group", help="Only this config group")
+    parser.add_argument("--top", type=int, default=0, help="Show the N largest assets per game/group")
+    parser.add_argument("--budgets", type=Path, default=BUDGETS_FILE, help="Budget file")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args()
+
+    graph = AssetGraph.build(ROOT)
+    results = analyze_all(graph, load_budgets(args.budgets), args.game, args.group)
+
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+    else:
+        print(f"{'game':<16} {'group':<24} {'total':>10} {'critical':>10} {'requests':>9}  status")
+        for result in results:
+            status = "; ".join(result['violations']) or "ok"
+            if result['missing']:
+                status += f", {len(result['missing'])} missing"
+            if result['external']:
+                status += f", {result['external']} external of unknown size"
+            print(f"{result['game']:<16} {str(result['group'] or '-'):<24} "
+                  f"{format_size(result['total_bytes']):>10} {format_size(result['critical_bytes']):>10} "
+                  f"{result['requests']:>9}  {status}")
+            for asset in result['assets'][:args.top]:
+                marker = "*" if asset['critical'] else " "
+                print(f"    {marker} {format_size(asset['size']):>10}  {asset['path']}")
+        if args.top:
+            print("(* = critical path)")
+
+    if any(result['violations'] for result in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Generate an offline precache manifest for every game.
+
+Each game gets <game>/precache-manifest.json listing everything the asset
+graph says it can request (page, code, configs and the assets of every
+config group), with a content hash per file and a version derived from all
+of them. The service worker in /sw.js caches the listed files on the first
+visit and afterwards re-downloads only files whose hash changed.
+
+File hashes are cached in .precache-cache.json by size and mtime, so
+regenerating after a small change only re-hashes the changed files.
+
+Run from the repo root (part of `npm run build`):
+  python3 scripts/precache_manifest.py
+"""
+
+import argparse
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from asset_graph import ROOT, AssetGraph
+
+MANIFEST_NAME = "precache-manifest.json"
+HASH_CACHE_FILE = ".precache-cache.json"
+
+
+class HashCache:
+    """Content hashes keyed by path, reused while a file's size and mtime are unchanged."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.entries = {}
+        if path.is_file():
+            with path.open(encoding="utf-8") as f:
+                self.entries = json.load(f)
+        self.hashed = 0
+
+    def digest(self, file_path: Path) -> str:
+        st = file_path.stat()
+        key = file_path.as_posix()
+        entry = self.entries.get(key)
+        if entry and entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns:
+            return entry["sha256"]
+        digest = hashlib.sha256(file_path.read_bytes()).hexdigest()
+        self.entries[key] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": digest}
+        self.hashed += 1
+        return digest
+
+    def save(self):
+        with self.path.open("w", encoding="utf-8") as f:
+            json.dump(self.entries, f)
+
+
+def build_manifest(graph: AssetGraph, game: str, hashes: HashCache) -> dict:
+    """
+    The precache manifest of one game.
+
+    URLs are relative to the game's folder, as the game's own pages request
+    them. External (CDN) files are listed with a null revision; the service
+    worker caches them as opaque responses.
+
+    Returns:
+        dict: 'game', 'version' and 'assets' (list of {'url', 'revision', 'size'}).
+    """
+    assets = []
+    for ref in graph.for_game(game):
+        if ref.kind == "external":
+            assets.append({"url": ref.path, "revision": None, "size": None})
+        elif graph.exists(ref):
+            file_path = graph.root / ref.path
+            url = os.path.relpath(file_path, graph.root / game).replace(os.sep, "/")
+            assets.append({"url": url, "revision": hashes.digest(file_path)[:16],
+                           "size": file_path.stat().st_size})
+    assets.sort(key=lambda asset: asset["url"])
+
+    version = hashlib.sha256()
+    for asset in assets:
+        version.update(f"{asset['url']}\0{asset['revision']}\n".encode())
+    return {"game": game, "version": version.hexdigest()[:12], "assets": assets}
+
+
+def write_manifest(path: Path, manifest: dict) -> bool:
+    """Write the manifest unless an identical one is already there. Returns True if written."""
+    text = json.dumps(manifest, ensure_ascii=False, indent=2) + "\n"
+    if path.is_file() and path.read_text(encoding="utf-8") == text:
+        return False
+    path.write_text(text, encoding="utf-8")
+    return True
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--game", action="append", help="Only this game (repeatable)")
+    args = parser.parse_args()
+
+    graph = AssetGraph.build(ROOT)
+    hashes = HashCache(ROOT / HASH_CACHE_FILE)
+    for game in args.game or graph.games():
+        manifest = build_manifest(graph, game, hashes)
+        written = write_manifest(ROOT / game / MANIFEST_NAME, manifest)
+        total = sum(asset["size"] or 0 for asset in manifest["assets"])
+        print(f"{game:<16} v{manifest['version']}  {len(manifest['assets']):>4} files "
+              f"{total / 1024:>8.1f} KB  {'updated' if written else 'unchanged'}")
+    hashes.save()
+    print(f"Hashed {hashes.hashed} changed files")
+
+
+if __name__ == "__main__":
+    main()
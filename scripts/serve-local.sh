@@ -11,6 +11,7 @@ echo ""
 echo "Serving entire repo at http://localhost:${PORT}/"
 echo "  Homepage:     http://localhost:${PORT}/index.html"
 echo "  Escape room:  http://localhost:${PORT}/escape_room/"
+echo "  Request log:  ${ROOT}/serve-local.log"
 echo ""
 cd "$ROOT"
-exec python3 -m http.server "$PORT"
+exec python3 "$ROOT/scripts/serve_local.py" --port "$PORT" --log "$ROOT/serve-local.log"
@@ -0,0 +1,386 @@
+"""Static file server for running the games locally or in a classroom.
+
+A drop-in replacement for `python3 -m http.server` that many tablets can use
+at once:
+  - one thread per connection, with HTTP/1.1 keep-alive
+  - Range requests, so audio can be seeked and streamed
+  - ETag / If-None-Match and Last-Modified / If-Modified-Since revalidation
+  - gzip (and brotli, if the `brotli` package is installed) for text assets;
+    precompressed `file.br` / `file.gz` siblings are served when present,
+    otherwise the compressed body is built once and kept in memory
+  - long-lived caching for fingerprinted build assets (escape_room/assets/)
+  - a timing line for every request
+
+Run from the repo root:
+  python3 scripts/serve_local.py --port 8080 --log serve-local.log
+"""
+
+import argparse
+import email.utils
+import gzip
+import os
+import re
+import socket
+import sys
+import threading
+import time
+from collections import OrderedDict
+from functools import partial
+from http import HTTPStatus
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:  # Optional; gzip alone covers every browser.
+    brotli = None
+
+ROOT = Path(__file__).resolve().parent.parent
+
+COMPRESSIBLE_TYPES = {
+    "application/json",
+    "application/javascript",
+    "application/manifest+json",
+    "application/xml",
+    "application/yaml",
+    "image/svg+xml",
+}
+# Bodies larger than this are streamed uncompressed rather than held in memory.
+MAX_COMPRESS_SIZE = 8 * 1024 * 1024
+COMPRESS_CACHE_SIZE = 64 * 1024 * 1024
+CHUNK_SIZE = 64 * 1024
+
+# Vite names build output like index-BxK3d9aF.js; scripts/compile_configs.py
+# names shards by content hash (compiled/d35a8b519c3d.json); other tools
+# append hex digests.
+FINGERPRINT_RE = re.compile(r"(/assets/.+-[A-Za-z0-9_-]{8}|[/.-][0-9a-f]{8,})\.\w+$")
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+
+class CompressionCache:
+    """LRU of compressed bodies, keyed by path, version and encoding."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.total = 0
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, path: str, version: tuple, encoding: str) -> bytes:
+        key = (path, version, encoding)
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                return self.entries[key]
+
+        with open(path, "rb") as f:
+            data = f.read()
+        if encoding == "br":
+            body = brotli.compress(data, quality=5)
+        else:
+            body = gzip.compress(data, compresslevel=6, mtime=0)
+
+        with self.lock:
+            if key not in self.entries:
+                self.entries[key] = body
+                self.total += len(body)
+            while self.total > self.max_bytes and len(self.entries) > 1:
+                _, evicted = self.entries.popitem(last=False)
+                self.total -= len(evicted)
+        return body
+
+
+class RequestLog:
+    """Writes one timing line per request to stderr and, optionally, a file."""
+
+    def __init__(self, path: str = None):
+        self.file = open(path, "a", encoding="utf-8", buffering=1) if path else None
+        self.lock = threading.Lock()
+
+    def write(self, line: str):
+        with self.lock:
+            sys.stderr.write(line + "\n")
+            if self.file:
+                self.file.write(line + "\n")
+
+
+def parse_range(header: str, size: int):
+    """
+    Parse a single-range `Range: bytes=...` header.
+
+    Returns:
+        (start, end) inclusive, None to serve the whole file (absent,
+        malformed or multi-range headers), or "unsatisfiable".
+    """
+    match = re.fullmatch(r"\s*bytes=(\d*)-(\d*)\s*", header or "")
+    if not match or match.group(1) == match.group(2) == "":
+        return None
+    first, last = match.groups()
+    if first == "":
+        length = int(last)
+        if length == 0:
+            return "unsatisfiable"
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or end < start:
+        return "unsatisfiable"
+    return start, end
+
+
+def etag_matches(header: str, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag."""
+    if header.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in header.split(",")]
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+class StaticHandler(SimpleHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Drop idle keep-alive connections so they don't hold threads forever.
+    timeout = 30
+
+    extensions_map = {
+        **SimpleHTTPRequestHandler.extensions_map,
+        ".js": "application/javascript",
+        ".mjs": "application/javascript",
+        ".json": "application/json",
+        ".webmanifest": "application/manifest+json",
+        ".yaml": "application/yaml",
+        ".yml": "application/yaml",
+        ".mp3": "audio/mpeg",
+        ".svg": "image/svg+xml",
+    }
+
+    compression_cache = None
+    request_log = None
+
+    # --- timing log -------------------------------------------------------
+
+    def parse_request(self):
+        # Start timing once the request line has arrived, not while the
+        # connection sits idle between keep-alive requests.
+        self._started = time.perf_counter()
+        self._status = None
+        self._sent = 0
+        self._encoding = "-"
+        return super().parse_request()
+
+    def send_response(self, code, message=None):
+        self._status = code
+        super().send_response(code, message)
+
+    def send_header(self, keyword, value):
+        if keyword.lower() == "content-encoding":
+            self._encoding = value
+        elif keyword.lower() == "content-length" and self.command != "HEAD":
+            self._sent = int(value)
+        super().send_header(keyword, value)
+
+    def log_request(self, code="-", size="-"):
+        pass
+
+    def handle_one_request(self):
+        self._status = None
+        super().handle_one_request()
+        if self._status is not None and self.request_log is not None:
+            elapsed = (time.perf_counter() - self._started) * 1000
+            self.request_log.write(
+                f"{time.strftime('%Y-%m-%d %H:%M:%S')} {self.client_address[0]} "
+                f'"{self.command} {self.path}" {self._status} {self._sent}B '
+                f"{elapsed:.1f}ms {self._encoding}"
+            )
+
+    # --- serving ----------------------------------------------------------
+
+    def do_GET(self):
+        self._serve(head=False)
+
+    def do_HEAD(self):
+        self._serve(head=True)
+
+    def _serve_stock(self, head: bool):
+        """Directory redirects, listings and errors, as http.server does them."""
+        f = super().send_head()
+        if f:
+            try:
+                if not head:
+                    self.copyfile(f, self.wfile)
+            finally:
+                f.close()
+
+    def _choose_encoding(self, path: str, ctype: str, st: os.stat_result):
+        """
+        Pick a compressed representation the client accepts.
+
+        Returns:
+            (encoding, precompressed path or None), or (None, None) for identity.
+        """
+        if not (ctype.startswith("text/") or ctype in COMPRESSIBLE_TYPES):
+            return None, None
+        accepted = {
+            token.split(";")[0].strip().lower()
+            for token in self.headers.get("Accept-Encoding", "").split(",")
+        }
+        for encoding, suffix in (("br", ".br"), ("gzip", ".gz")):
+            if encoding not in accepted:
+                continue
+            sibling = path + suffix
+            if os.path.isfile(sibling) and os.stat(sibling).st_mtime_ns >= st.st_mtime_ns:
+                return encoding, sibling
+            if (encoding == "gzip" or brotli is not None) and st.st_size <= MAX_COMPRESS_SIZE:
+                return encoding, None
+        return None, None
+
+    def _serve(self, head: bool):
+        path = self.translate_path(self.path)
+        if os.path.isdir(path):
+            index = os.path.join(path, "index.html")
+            if not self.path.split("?", 1)[0].endswith("/") or not os.path.isfile(index):
+                return self._serve_stock(head)
+            path = index
+        if not os.path.isfile(path):
+            self.send_error(HTTPStatus.NOT_FOUND, "File not found")
+            return
+
+        st = os.stat(path)
+        ctype = self.guess_type(path)
+        encoding, precompressed = self._choose_encoding(path, ctype, st)
+        etag = f'"{st.st_size:x}-{st.st_mtime_ns:x}' + (f'-{encoding}"' if encoding else '"')
+        url_path = self.path.split("?", 1)[0]
+        cache_control = IMMUTABLE if FINGERPRINT_RE.search(url_path) else REVALIDATE
+
+        def common_headers():
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", email.utils.formatdate(st.st_mtime, usegmt=True))
+            self.send_header("Cache-Control", cache_control)
+            if ctype.startswith("text/") or ctype in COMPRESSIBLE_TYPES:
+                self.send_header("Vary", "Accept-Encoding")
+
+        if self._not_modified(etag, st):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            common_headers()
+            self.end_headers()
+            return
+
+        if encoding:
+            if precompressed:
+                body_path, start, length = precompressed, 0, os.path.getsize(precompressed)
+                body = None
+            else:
+                body = self.compression_cache.get(path, (st.st_size, st.st_mtime_ns), encoding)
+                length = len(body)
+            self.send_response(HTTPStatus.OK)
+            self.send_header("Content-Type", ctype)
+            self.send_header("Content-Encoding", encoding)
+            self.send_header("Content-Length", str(length))
+            common_headers()
+            self.end_headers()
+            if head:
+                return
+            if body is not None:
+                self._write(body)
+            else:
+                self._copy_range(body_path, start, length)
+            return
+
+        byte_range = None
+        if_range = self.headers.get("If-Range")
+        if "Range" in self.headers and (if_range is None or if_range.strip() == etag):
+            byte_range = parse_range(self.headers["Range"], st.st_size)
+        if byte_range == "unsatisfiable":
+            self.send_response(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+            self.send_header("Content-Range", f"bytes */{st.st_size}")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        if byte_range is None:
+            start, length = 0, st.st_size
+            self.send_response(HTTPStatus.OK)
+        else:
+            start, end = byte_range
+            length = end - start + 1
+            self.send_response(HTTPStatus.PARTIAL_CONTENT)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{st.st_size}")
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(length))
+        self.send_header("Accept-Ranges", "bytes")
+        common_headers()
+        self.end_headers()
+        if not head:
+            self._copy_range(path, start, length)
+
+    def _not_modified(self, etag: str, st: os.stat_result) -> bool:
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match is not None:
+            return etag_matches(if_none_match, etag)
+        if_modified_since = self.headers.get("If-Modified-Since")
+        if if_modified_since:
+            try:
+                since = email.utils.parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+            return int(st.st_mtime) <= since
+        return False
+
+    def _write(self, data: bytes):
+        try:
+            self.wfile.write(data)
+        except (BrokenPipeError, ConnectionResetError):
+            # Audio players routinely abort a response when the user seeks.
+            self.close_connection = True
+
+    def _copy_range(self, path: str, start: int, length: int):
+        with open(path, "rb") as f:
+            f.seek(start)
+            remaining = length
+            while remaining > 0:
+                chunk = f.read(min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                try:
+                    self.wfile.write(chunk)
+                except (BrokenPipeError, ConnectionResetError):
+                    self.close_connection = True
+                    return
+
+
+def lan_address() -> str:
+    """Best guess at this machine's address on the local network."""
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+        try:
+            s.connect(("10.255.255.255", 1))
+            return s.getsockname()[0]
+        except OSError:
+            return "127.0.0.1"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--bind", default="", help="Address to listen on (default: all interfaces)")
+    parser.add_argument("--directory", default=str(ROOT), help="Directory to serve (default: repo root)")
+    parser.add_argument("--log", help="Also append the request timing log to this file")
+    args = parser.parse_args()
+
+    StaticHandler.compression_cache = CompressionCache(COMPRESS_CACHE_SIZE)
+    StaticHandler.request_log = RequestLog(args.log)
+    handler = partial(StaticHandler, directory=args.directory)
+
+    with ThreadingHTTPServer((args.bind, args.port), handler) as server:
+        print(f"Serving {args.directory} on http://localhost:{args.port}/ "
+              f"(LAN: http://{lan_address()}:{args.port}/)")
+        if brotli is None:
+            print("brotli not installed; compressing with gzip only")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print("\nStopped.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+// Offline support for the games.
+//
+// Every game page registers this worker with its own folder as the scope:
+//     navigator.serviceWorker.register('../sw.js', { scope: './' });
+// The worker precaches the files listed in that folder's
+// precache-manifest.json (generated by scripts/precache_manifest.py) and then
+// serves them from the cache. When the manifest's version changes, only files
+// whose revision changed (or that failed to download) are fetched again.
+
+const SCOPE = self.registration.scope;
+const CACHE_NAME = `precache:${new URL(SCOPE).pathname}`;
+const MANIFEST_URL = new URL('precache-manifest.json', SCOPE).href;
+const INDEX_URL = new URL('index.html', SCOPE).href;
+const MAX_PARALLEL_DOWNLOADS = 6;
+const UPDATE_INTERVAL_MS = 60 * 1000;
+
+let lastUpdateCheck = 0;
+
+function assetUrl(asset) {
+    return new URL(asset.url, SCOPE).href;
+}
+
+async function fetchManifest() {
+    const response = await fetch(MANIFEST_URL, { cache: 'no-cache' });
+    if (!response.ok) {
+        throw new Error(`Could not load ${MANIFEST_URL}: ${response.status}`);
+    }
+    return response.json();
+}
+
+// Revision of each precached file, kept on its cached response
+const REVISION_HEADER = 'X-Precache-Revision';
+
+async function cacheAsset(cache, asset) {
+    const url = assetUrl(asset);
+    const cached = await cache.match(url);
+    // External files (revision null) are cached once and kept.
+    if (cached && (asset.revision === null || cached.headers.get(REVISION_HEADER) === asset.revision)) {
+        return;
+    }
+    // External files can only be cached as opaque responses, whose headers can't be changed.
+    if (asset.revision === null) {
+        await cache.put(url, await fetch(new Request(url, { mode: 'no-cors' })));
+        return;
+    }
+    const response = await fetch(new Request(url, { cache: 'no-cache' }));
+    if (!response.ok) {
+        throw new Error(`Could not cache ${url}: ${response.status}`);
+    }
+    const headers = new Headers(response.headers);
+    headers.set(REVISION_HEADER, asset.revision);
+    await cache.put(url, new Response(response.body, {
+        status: response.status,
+        statusText: response.statusText,
+        headers
+    }));
+}
+
+async function precache(manifest) {
+    const cache = await caches.open(CACHE_NAME);
+    const stored = await cache.match(MANIFEST_URL);
+    const previous = stored ? await stored.json() : { version: null };
+    if (previous.version === manifest.version) {
+        return;
+    }
+
+    // At most MAX_PARALLEL_DOWNLOADS files in flight
+    let running = 0;
+    const waiting = [];
+    async function throttled(task) {
+        while (running >= MAX_PARALLEL_DOWNLOADS) {
+            await new Promise(resolve => waiting.push(resolve));
+        }
+        running++;
+        try {
+            return await task();
+        } finally {
+            running--;
+            if (waiting.length > 0) {
+                waiting.shift()();
+            }
+        }
+    }
+    // Every file is cached as soon as it arrives, so a failed download
+    // doesn't cost the others and a retry only fetches what is missing.
+    const results = await Promise.allSettled(
+        manifest.assets.map(asset => throttled(() => cacheAsset(cache, asset)))
+    );
+    const failures = results.filter(result => result.status === 'rejected').map(result => result.reason);
+    if (failures.length > 0) {
+        // Without the new manifest, the next update check tries again
+        throw new Error(`${failures.length} file(s) could not be cached: ${failures.map(error => error.message).join('; ')}`);
+    }
+
+    // Drop files the game no longer uses
+    const wanted = new Set(manifest.assets.map(assetUrl));
+    for (const request of await cache.keys()) {
+        if (!wanted.has(request.url) && request.url !== MANIFEST_URL) {
+            await cache.delete(request);
+        }
+    }
+
+    // Stored last, so an incomplete update is retried on the next check
+    await cache.put(MANIFEST_URL, new Response(JSON.stringify(manifest), {
+        headers: { 'Content-Type': 'application/json' }
+    }));
+}
+
+async function checkForUpdate() {
+    if (Date.now() - lastUpdateCheck < UPDATE_INTERVAL_MS) {
+        return;
+    }
+    lastUpdateCheck = Date.now();
+    try {
+        await precache(await fetchManifest());
+    } catch (error) {
+        // Offline or mid-deploy; keep serving the cached version
+        console.warn('Precache update failed:', error);
+    }
+}
+
+// Audio elements ask for byte ranges; answer them from the cached file
+async function rangeResponse(response, range) {
+    const body = await response.blob();
+    const match = /^bytes=(\d*)-(\d*)$/.exec(range.trim());
+    if (!match || (match[1] === '' && match[2] === '')) {
+        return response;
+    }
+    const start = match[1] === '' ? Math.max(body.size - Number(match[2]), 0) : Number(match[1]);
+    const end = match[1] === '' || match[2] === '' ? body.size - 1 : Math.min(Number(match[2]), body.size - 1);
+    if (start > end) {
+        return new Response(null, { status: 416, headers: { 'Content-Range': `bytes */${body.size}` } });
+    }
+    return new Response(body.slice(start, end + 1), {
+        status: 206,
+        headers: {
+            'Content-Type': response.headers.get('Content-Type') || '',
+            'Content-Range': `bytes ${start}-${end}/${body.size}`,
+            'Content-Length': String(end - start + 1)
+        }
+    });
+}
+
+async function respond(request) {
+    const cache = await caches.open(CACHE_NAME);
+    const isNavigation = request.mode === 'navigate';
+    // Pages are opened with ?category=... etc.
+    let cached = await cache.match(request, { ignoreSearch: isNavigation });
+    if (!cached && isNavigation && new URL(request.url).pathname === new URL(SCOPE).pathname) {
+        cached = await cache.match(INDEX_URL);
+    }
+    if (!cached) {
+        return fetch(request);
+    }
+    const range = request.headers.get('Range');
+    if (range && cached.type !== 'opaque') {
+        return rangeResponse(cached, range);
+    }
+    return cached;
+}
+
+self.addEventListener('install', event => {
+    // A partial precache still installs; navigations retry the missing files.
+    event.waitUntil(fetchManifest()
+        .then(manifest => precache(manifest).catch(error => console.warn('Precache incomplete:', error)))
+        .then(() => self.skipWaiting()));
+});
+
+self.addEventListener('activate', event => {
+    event.waitUntil(self.clients.claim());
+});
+
+self.addEventListener('fetch', event => {
+    if (event.request.method !== 'GET') {
+        return;
+    }
+    if (event.request.mode === 'navigate') {
+        event.waitUntil(checkForUpdate());
+    }
+    event.respondWith(respond(event.request));
+});